@@ -0,0 +1,78 @@
+import argparse
+import json
+import mapfile
+import multiprocessing
+import os
+import search
+import sys
+import time
+
+#we define known constants about the world maps
+startMarker = 's'
+dirtMarker = '*'
+obstacleMarkers = ['=', '|']
+
+#<summary>Searches a single map; runs in a worker process, so visualization is always turned off.</summary>
+#<param name='task'>A (map file name, algorithm name) tuple.</param>
+#<returns>A dictionary with the search results or, if the map couldn't be searched, with the error.</returns>
+def searchMap(task):
+    fileName, algorithm = task
+
+    #an exception would stop the whole batch in the parent process,
+    #so a broken map is reported instead and the other maps are still searched
+    try:
+        return _searchMap(fileName, algorithm)
+    except Exception as exception:
+        return {'map': fileName,
+                'algorithm': algorithm,
+                'error': '%s: %s' % (type(exception).__name__, exception)}
+
+#<summary>Searches a single map.</summary>
+#<param name='fileName'>Name of the map file.</param>
+#<param name='algorithm'>Name of the search algorithm.</param>
+#<returns>A dictionary with the search results.</returns>
+def _searchMap(fileName, algorithm):
+    startTime = time.time()
+    world = mapfile.MappedWorld(fileName)
+    searchLibrary = search.SearchLibrary(world, startMarker, obstacleMarkers, dirtMarker, False)
+
+    if algorithm == 'dfs':
+        dirtPositions = searchLibrary.depthFirstSearch()
+    elif algorithm == 'bfs':
+        dirtPositions = searchLibrary.breadthFirstSearch()
+    else:
+        dirtPositions = searchLibrary.floodFillSearch()
+
+    return {'map': fileName,
+            'algorithm': algorithm,
+            'reachableDirt': len(dirtPositions),
+            'expandedNodes': searchLibrary.numberOfExpandedNodes,
+            'runtime': time.time() - startTime}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Counts the reachable dirt locations in all maps of a directory and writes one JSON line per map.')
+    parser.add_argument('directory', help='directory with map files')
+    parser.add_argument('--algorithm', choices=['dfs', 'bfs', 'flood'], default='bfs', help='search algorithm (default: bfs)')
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(), help='number of worker processes (default: number of cores)')
+    parser.add_argument('--output', help='output file (default: standard output)')
+    arguments = parser.parse_args()
+
+    #subdirectories and other entries that aren't regular files are skipped
+    fileNames = [os.path.join(arguments.directory, fileName) for fileName in sorted(os.listdir(arguments.directory))]
+    tasks = [(fileName, arguments.algorithm) for fileName in fileNames if os.path.isfile(fileName)]
+
+    output = sys.stdout
+    if arguments.output is not None:
+        output = open(arguments.output, 'w')
+
+    #the results are written as soon as a map is done,
+    #so they don't come in the order of the map files
+    pool = multiprocessing.Pool(arguments.processes)
+    for result in pool.imap_unordered(searchMap, tasks):
+        output.write(json.dumps(result, sort_keys=True) + '\n')
+        output.flush()
+    pool.close()
+    pool.join()
+
+    if output is not sys.stdout:
+        output.close()
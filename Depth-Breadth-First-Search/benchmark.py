@@ -0,0 +1,72 @@
+import mapfile
+import os
+import random
+import search
+import tempfile
+import time
+
+#we define known constants about the world maps
+startMarker = 's'
+dirtMarker = '*'
+obstacleMarkers = ['=', '|']
+
+#<summary>Generates a random square world surrounded by walls.</summary>
+#<param name='size'>The number of rows and columns of the world.</param>
+#<param name='obstacleProbability'>Probability that an inner cell is an obstacle.</param>
+#<param name='dirtProbability'>Probability that an inner cell contains dirt.</param>
+#<returns>A list of strings that describes the world.</returns>
+def generateWorld(size, obstacleProbability=0.2, dirtProbability=0.01):
+    randomGenerator = random.Random(size)
+    world = ['=' * size]
+    for i in range(size - 2):
+        row = ['|']
+        for j in range(size - 2):
+            value = randomGenerator.random()
+            if value < obstacleProbability:
+                row.append('|')
+            elif value < obstacleProbability + dirtProbability:
+                row.append(dirtMarker)
+            else:
+                row.append(' ')
+        row.append('|')
+        world.append(''.join(row))
+    world.append('=' * size)
+
+    #the start position is placed in the middle of the world
+    middle = size / 2
+    world[middle] = world[middle][:middle] + startMarker + world[middle][middle+1:]
+    return world
+
+#<summary>Runs a depth-first and a breadth-first search in a world and prints their running times.</summary>
+#<param name='worldType'>A string describing how the world is stored.</param>
+#<param name='size'>The number of rows and columns of the world.</param>
+#<param name='world'>A list of strings or a 'mapfile.MappedWorld' object that describes the world.</param>
+def benchmarkWorld(worldType, size, world):
+    searchLibrary = search.SearchLibrary(world, startMarker, obstacleMarkers, dirtMarker, False)
+
+    startTime = time.time()
+    depthFirstGoals = searchLibrary.depthFirstSearch()
+    depthFirstTime = time.time() - startTime
+
+    startTime = time.time()
+    breadthFirstGoals = searchLibrary.breadthFirstSearch()
+    breadthFirstTime = time.time() - startTime
+
+    numberOfCells = size * size
+    print worldType.rjust(8) + str(size).rjust(8) + str(numberOfCells).rjust(12) + ('%.3f' % depthFirstTime).rjust(10) + ('%.3f' % breadthFirstTime).rjust(10) + ('%.3f' % (breadthFirstTime * 1e6 / numberOfCells)).rjust(15) + str(len(breadthFirstGoals)).rjust(8)
+
+#the time per cell should stay roughly constant as the worlds grow,
+#which shows that the searches scale linearly with the number of cells;
+#the same worlds are also searched after being loaded from a map file
+#with 'mapfile.MappedWorld', whose cells are used without copying them
+print 'world'.rjust(8) + 'size'.rjust(8) + 'cells'.rjust(12) + 'DFS [s]'.rjust(10) + 'BFS [s]'.rjust(10) + 'BFS [us/cell]'.rjust(15) + 'dirt'.rjust(8)
+for size in [100, 200, 400, 800, 1600]:
+    world = generateWorld(size)
+    benchmarkWorld('list', size, world)
+
+    mapFileDescriptor, mapFileName = tempfile.mkstemp(suffix='.txt')
+    mapFile = os.fdopen(mapFileDescriptor, 'w')
+    mapFile.write('\n'.join(world) + '\n')
+    mapFile.close()
+    benchmarkWorld('mapped', size, mapfile.MappedWorld(mapFileName))
+    os.remove(mapFileName)
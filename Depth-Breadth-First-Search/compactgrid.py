@@ -0,0 +1,202 @@
+import ctypes
+import grid
+import mapfile
+import numpy
+
+#<summary>Stores a grid world as a single flat byte buffer and addresses its cells with integer ids.
+#Every row is followed by a separator byte, so a cell id is 'row * stride + column' with
+#'stride = numberOfColumns + 1'; the separators are treated as obstacles, which means that
+#moving left or right never wraps around to a neighbouring row.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class CompactGrid:
+    separator = '\n'
+
+    #<summary>Creates a new compact grid.</summary>
+    #<param name='world'>A two dimensional list of characters that describes the world or a 'mapfile.MappedWorld' object.</param>
+    #<param name='obstacleMarkers'>A list of characters defining the obstacle markers in the world.</param>
+    def __init__(self, world, obstacleMarkers):
+        self.numberOfRows = len(world)
+        self.numberOfColumns = len(world[0])
+        self.stride = self.numberOfColumns + 1
+
+        #'buffer' is used for finding markers and 'cells' for accessing
+        #single cells by id; a memory-mapped file whose rows are all equally
+        #long already has the layout we need, so it is used without copying.
+        #The cells of the mapping are read through a ctypes array rather than
+        #a numpy view, since indexing a numpy array returns numpy scalars,
+        #which make the per-cell loops of the searches much slower
+        if isinstance(world, mapfile.MappedWorld) and world.uniformStride() == self.stride:
+            self.buffer = world.buffer
+            self.cells = (ctypes.c_ubyte * len(world.buffer)).from_buffer(world.buffer)
+        else:
+            #rows that are shorter than the first one are padded with obstacles
+            #and longer rows are truncated, since the cells outside the
+            #first row's width are never visited by the search
+            padding = obstacleMarkers[0]
+            rows = []
+            for i in range(self.numberOfRows):
+                row = world[i][:self.numberOfColumns]
+                rows.append(row + padding * (self.numberOfColumns - len(row)) + self.separator)
+            self.buffer = bytearray(''.join(rows))
+            self.cells = self.buffer
+        self.size = len(self.cells)
+
+        #a lookup table indexed by byte value; a cell is blocked
+        #if the table entry for its marker is set
+        self.blocked = bytearray(256)
+        for marker in obstacleMarkers:
+            self.blocked[ord(marker)] = 1
+        self.blocked[ord(self.separator)] = 1
+
+    #<summary>Converts a position in the world to a cell id.</summary>
+    #<param name='row'>A number denoting grid row.</param>
+    #<param name='column'>A number denoting grid column.</param>
+    #<returns>The id of the cell.</returns>
+    def cellId(self, row, column):
+        return row * self.stride + column
+
+    #<summary>Converts a cell id to a position in the world.</summary>
+    #<param name='cell'>The id of a cell.</param>
+    #<returns>A 'grid.Coordinates' object that stores the position of the cell.</returns>
+    def coordinates(self, cell):
+        row, column = divmod(cell, self.stride)
+        return grid.Coordinates(row, column)
+
+    #<summary>Looks for the first cell (in row-major order) that contains a given marker.</summary>
+    #<param name='marker'>The character we are looking for.</param>
+    #<returns>The id of the cell or -1 if the marker does not appear in the world.</returns>
+    def findMarker(self, marker):
+        return self.buffer.find(marker)
+
+    #<summary>Finds all cells that contain a given marker.</summary>
+    #<param name='marker'>The character we are looking for.</param>
+    #<returns>A list of cell ids in row-major order.</returns>
+    def findAllMarkers(self, marker):
+        cellIds = []
+        cell = self.buffer.find(marker)
+        while cell != -1:
+            cellIds.append(cell)
+            cell = self.buffer.find(marker, cell + 1)
+        return cellIds
+
+    #<summary>Checks whether a cell is blocked by an obstacle.</summary>
+    #<param name='cell'>The id of a cell.</param>
+    #<returns>'True' if the cell is an obstacle and 'False' otherwise.</returns>
+    def isBlocked(self, cell):
+        return self.blocked[self.cells[cell]] == 1
+
+    #<summary>Changes the marker of a cell.</summary>
+    #<param name='cell'>The id of a cell.</param>
+    #<param name='marker'>The new marker of the cell.</param>
+    def setMarker(self, cell, marker):
+        self.cells[cell] = ord(marker)
+
+    #<summary>Finds all neighbours of a cell; takes into account
+    #         the constraint that diagonal movements are not allowed.
+    #         The neighbours are generated in the same order as in 'SearchLibrary' (down, up, right, left).
+    #</summary>
+    #<param name='cell'>The id of the cell whose neighbours we want to find.</param>
+    #<returns>A list of cell ids.</returns>
+    def neighbours(self, cell):
+        cells = self.cells
+        blocked = self.blocked
+        neighbours = []
+
+        down = cell + self.stride
+        if down < self.size and not blocked[cells[down]]:
+            neighbours.append(down)
+
+        up = cell - self.stride
+        if up > -1 and not blocked[cells[up]]:
+            neighbours.append(up)
+
+        #the separator bytes stop us from leaving a row on the right or on the left
+        right = cell + 1
+        if right < self.size and not blocked[cells[right]]:
+            neighbours.append(right)
+
+        left = cell - 1
+        if left > -1 and not blocked[cells[left]]:
+            neighbours.append(left)
+
+        return neighbours
+
+    #<summary>Finds the diagonal neighbours of a cell. A diagonal move is only allowed
+    #if both cells next to it are free, so that moves never cut obstacle corners.
+    #</summary>
+    #<param name='cell'>The id of the cell whose neighbours we want to find.</param>
+    #<returns>A list of cell ids.</returns>
+    def diagonalNeighbours(self, cell):
+        cells = self.cells
+        blocked = self.blocked
+        neighbours = []
+
+        for verticalStep in [self.stride, -self.stride]:
+            verticalCell = cell + verticalStep
+            if verticalCell < 0 or verticalCell >= self.size or blocked[cells[verticalCell]]:
+                continue
+
+            for horizontalStep in [1, -1]:
+                horizontalCell = cell + horizontalStep
+                diagonalCell = verticalCell + horizontalStep
+                if horizontalCell < 0 or horizontalCell >= self.size or blocked[cells[horizontalCell]]:
+                    continue
+                if diagonalCell > -1 and diagonalCell < self.size and not blocked[cells[diagonalCell]]:
+                    neighbours.append(diagonalCell)
+
+        return neighbours
+
+    #<summary>Creates a numpy view of the cells, such that the separators form the last column.</summary>
+    #<returns>A two dimensional numpy array of byte values.</returns>
+    def cellArray(self):
+        cells = numpy.frombuffer(self.buffer, dtype=numpy.uint8)
+
+        #the separator after the last row might be missing
+        missingCells = self.numberOfRows * self.stride - self.size
+        if missingCells > 0:
+            cells = numpy.append(cells, numpy.full(missingCells, ord(self.separator), dtype=numpy.uint8))
+
+        return cells.reshape(self.numberOfRows, self.stride)
+
+    #<summary>Finds the cells that are not blocked by obstacles.</summary>
+    #<returns>A two dimensional boolean numpy array with the same layout as 'cellArray'.</returns>
+    def freeMask(self):
+        blocked = numpy.frombuffer(self.blocked, dtype=numpy.uint8) == 1
+        return ~blocked[self.cellArray()]
+
+    #<summary>Finds the cells that contain a given marker.</summary>
+    #<param name='marker'>The character we are looking for.</param>
+    #<returns>A two dimensional boolean numpy array with the same layout as 'cellArray'.</returns>
+    def markerMask(self, marker):
+        return self.cellArray() == ord(marker)
+
+    #<summary>Finds the length of the shortest path from a number of source cells to every cell
+    #using a breadth-first search in which all cells at the same distance are expanded
+    #together with numpy operations; the moves follow the same rules as 'neighbours'.
+    #</summary>
+    #<param name='sourceCells'>A list of cell ids.</param>
+    #<param name='dtype'>The numpy integer type of the distances.</param>
+    #<returns>A flat numpy array indexed by cell id; the cells that cannot be reached
+    #get the largest value that 'dtype' can represent.
+    #</returns>
+    def distanceField(self, sourceCells, dtype=numpy.uint32):
+        free = self.freeMask().ravel()
+        numberOfCells = len(free)
+        unreached = numpy.iinfo(dtype).max
+        steps = numpy.array([self.stride, -self.stride, 1, -1])
+
+        distances = numpy.full(numberOfCells, unreached, dtype=dtype)
+        frontier = numpy.unique(numpy.array(sourceCells, dtype=numpy.int64))
+        distances[frontier] = 0
+
+        distance = 0
+        while len(frontier) > 0:
+            distance += 1
+            candidates = (frontier[:, numpy.newaxis] + steps).ravel()
+            candidates = candidates[(candidates > -1) & (candidates < numberOfCells)]
+            candidates = candidates[free[candidates] & (distances[candidates] == unreached)]
+            frontier = numpy.unique(candidates)
+            distances[frontier] = distance
+
+        return distances
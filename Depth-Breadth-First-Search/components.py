@@ -0,0 +1,241 @@
+from array import array
+from collections import deque
+
+#<summary>Defines an index of the connected components of a grid world, which answers
+#reachability queries without searching the world. The index is built once per world
+#and is kept up to date when cells switch between being obstacles and being free.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class ComponentIndex:
+    #<summary>Labels the connected components of a world.</summary>
+    #<param name='compactGrid'>A 'compactgrid.CompactGrid' object describing the world; the index keeps a reference to it.</param>
+    #<param name='goalMarker'>A character defining a goal position.</param>
+    def __init__(self, compactGrid, goalMarker):
+        self.grid = compactGrid
+        self.goalMarker = ord(goalMarker)
+
+        #'labels' stores a component label for each cell (0 for blocked cells);
+        #labels are merged with a union-find structure, so 'parents' maps
+        #each label to its parent label and only roots are used as keys
+        #of the 'sizes' and 'goals' dictionaries
+        self.labels = array('i', [0]) * self.grid.size
+        self.parents = [0]
+        self.sizes = dict()
+        self.goals = dict()
+
+        for cell in range(self.grid.size):
+            if self.labels[cell] == 0 and not self.grid.isBlocked(cell):
+                self._labelComponent(cell)
+
+    #<summary>Checks whether one position in the world can be reached from another.</summary>
+    #<param name='source'>A 'grid.Coordinates' object.</param>
+    #<param name='target'>A 'grid.Coordinates' object.</param>
+    #<returns>'True' if there is a path between the positions and 'False' otherwise.</returns>
+    def reachable(self, source, target):
+        sourceComponent = self._component(self._cell(source))
+        targetComponent = self._component(self._cell(target))
+        return sourceComponent != 0 and sourceComponent == targetComponent
+
+    #<summary>Counts the goal positions that can be reached from a given position.</summary>
+    #<param name='position'>A 'grid.Coordinates' object.</param>
+    #<returns>The number of reachable goal positions.</returns>
+    def numberOfReachableGoals(self, position):
+        component = self._component(self._cell(position))
+        if component == 0:
+            return 0
+        return len(self.goals[component])
+
+    #<summary>Finds the goal positions that can be reached from a given position.</summary>
+    #<param name='position'>A 'grid.Coordinates' object.</param>
+    #<returns>A list of 'grid.Coordinates' objects in row-major order.</returns>
+    def reachableGoals(self, position):
+        component = self._component(self._cell(position))
+        goalPositions = []
+        if component != 0:
+            for cell in sorted(self.goals[component]):
+                goalPositions.append(self.grid.coordinates(cell))
+        return goalPositions
+
+    #<summary>Changes the marker of a cell in the world and updates the index.
+    #Freeing a cell merges the components around it, while blocking a cell
+    #only relabels the parts of its component that get disconnected.
+    #</summary>
+    #<param name='position'>A 'grid.Coordinates' object.</param>
+    #<param name='marker'>The new marker of the cell.</param>
+    def setCell(self, position, marker):
+        cell = self._cell(position)
+        wasBlocked = self.grid.isBlocked(cell)
+        component = self._component(cell)
+        if component != 0:
+            self.goals[component].discard(cell)
+
+        self.grid.setMarker(cell, marker)
+        isBlocked = self.grid.isBlocked(cell)
+
+        if wasBlocked and not isBlocked:
+            self._addCell(cell)
+        elif not wasBlocked and isBlocked:
+            self._removeCell(cell, component)
+        elif not isBlocked and self.grid.cells[cell] == self.goalMarker:
+            self.goals[component].add(cell)
+
+    #<param name='position'>A 'grid.Coordinates' object.</param>
+    #<returns>The id of the cell at the given position.</returns>
+    def _cell(self, position):
+        return self.grid.cellId(position.getRow(), position.getColumn())
+
+    #<summary>Finds the root label of the component that a cell belongs to.</summary>
+    #<param name='cell'>The id of a cell.</param>
+    #<returns>The root label or 0 if the cell is blocked.</returns>
+    def _component(self, cell):
+        label = self.labels[cell]
+        parents = self.parents
+
+        #path halving keeps the union-find trees flat
+        while parents[label] != label:
+            parents[label] = parents[parents[label]]
+            label = parents[label]
+        return label
+
+    #<summary>Creates a new component label.</summary>
+    #<returns>The new label.</returns>
+    def _newLabel(self):
+        label = len(self.parents)
+        self.parents.append(label)
+        self.sizes[label] = 0
+        self.goals[label] = set()
+        return label
+
+    #<summary>Assigns a new label to all free cells that can be reached from a given cell.</summary>
+    #<param name='startCell'>The id of a free cell.</param>
+    def _labelComponent(self, startCell):
+        label = self._newLabel()
+        cells = self.grid.cells
+        goals = self.goals[label]
+
+        queue = deque([startCell])
+        self.labels[startCell] = label
+        numberOfCells = 0
+        while len(queue) > 0:
+            currentCell = queue.popleft()
+            numberOfCells += 1
+            if cells[currentCell] == self.goalMarker:
+                goals.add(currentCell)
+
+            for neighbour in self.grid.neighbours(currentCell):
+                if self.labels[neighbour] != label:
+                    self.labels[neighbour] = label
+                    queue.append(neighbour)
+
+        self.sizes[label] = numberOfCells
+
+    #<summary>Updates the index after a blocked cell becomes free.</summary>
+    #<param name='cell'>The id of the cell.</param>
+    def _addCell(self, cell):
+        label = self._newLabel()
+        self.labels[cell] = label
+        self.sizes[label] = 1
+        if self.grid.cells[cell] == self.goalMarker:
+            self.goals[label].add(cell)
+
+        for neighbour in self.grid.neighbours(cell):
+            self._merge(label, self._component(neighbour))
+            label = self._component(cell)
+
+    #<summary>Updates the index after a free cell becomes blocked.
+    #The component might be split, so we run interleaved breadth-first searches
+    #from the free neighbours of the cell; when two searches meet, they are merged,
+    #and when a search runs out of nodes, the cells it has visited form a separate
+    #component and get a new label. The search that is left last keeps the old label,
+    #so the amount of work depends on the size of the pieces that split off
+    #rather than on the size of the whole component.
+    #</summary>
+    #<param name='cell'>The id of the cell.</param>
+    #<param name='component'>The root label of the component that the cell belonged to.</param>
+    def _removeCell(self, cell, component):
+        self.labels[cell] = 0
+        self.sizes[component] -= 1
+
+        neighbours = self.grid.neighbours(cell)
+        if len(neighbours) == 0:
+            del self.sizes[component]
+            del self.goals[component]
+            return
+
+        #searches are identified by the index of the neighbour they started from;
+        #'owners' stores the search that first visited a cell and 'searchParents'
+        #stores the search that each search has been merged into
+        owners = dict()
+        searchParents = range(len(neighbours))
+        queues = []
+        visitedCells = []
+        for i in range(len(neighbours)):
+            owners[neighbours[i]] = i
+            queues.append(deque([neighbours[i]]))
+            visitedCells.append([neighbours[i]])
+
+        activeSearches = range(len(neighbours))
+        while len(activeSearches) > 1:
+            for search in list(activeSearches):
+                if search not in activeSearches or len(activeSearches) == 1:
+                    continue
+
+                if len(queues[search]) == 0:
+                    activeSearches.remove(search)
+                    self._splitComponent(visitedCells[search], component)
+                    continue
+
+                currentCell = queues[search].popleft()
+                for neighbour in self.grid.neighbours(currentCell):
+                    if neighbour not in owners:
+                        owners[neighbour] = search
+                        queues[search].append(neighbour)
+                        visitedCells[search].append(neighbour)
+                        continue
+
+                    owner = owners[neighbour]
+                    while searchParents[owner] != owner:
+                        owner = searchParents[owner]
+
+                    if owner != search:
+                        searchParents[owner] = search
+                        queues[search].extend(queues[owner])
+                        visitedCells[search].extend(visitedCells[owner])
+                        activeSearches.remove(owner)
+
+    #<summary>Moves a number of cells from a component to a new component.</summary>
+    #<param name='componentCells'>A list of cell ids.</param>
+    #<param name='component'>The root label of the component that the cells belonged to.</param>
+    def _splitComponent(self, componentCells, component):
+        label = self._newLabel()
+        oldGoals = self.goals[component]
+        newGoals = self.goals[label]
+        for cell in componentCells:
+            self.labels[cell] = label
+            if cell in oldGoals:
+                oldGoals.remove(cell)
+                newGoals.add(cell)
+
+        self.sizes[label] = len(componentCells)
+        self.sizes[component] -= len(componentCells)
+
+    #<summary>Merges two components; the smaller one is attached to the larger one.</summary>
+    #<param name='component1'>The root label of a component.</param>
+    #<param name='component2'>The root label of another component.</param>
+    def _merge(self, component1, component2):
+        if component1 == component2:
+            return
+
+        if self.sizes[component1] < self.sizes[component2]:
+            component1, component2 = component2, component1
+
+        self.parents[component2] = component1
+        self.sizes[component1] += self.sizes.pop(component2)
+
+        #the goals of the smaller component are moved to the larger one
+        smallerGoals = self.goals.pop(component2)
+        largerGoals = self.goals[component1]
+        if len(smallerGoals) > len(largerGoals):
+            smallerGoals, largerGoals = largerGoals, smallerGoals
+            self.goals[component1] = largerGoals
+        largerGoals.update(smallerGoals)
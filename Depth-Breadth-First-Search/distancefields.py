@@ -0,0 +1,96 @@
+from collections import OrderedDict
+import hashlib
+import numpy
+import os
+
+#<summary>Precomputes and caches the obstacle-aware distance fields of frequently used goals.
+#A distance field stores the length of the shortest path from every cell to the closest goal,
+#so a shortest path to the goals can be found by descending the field from any cell, which
+#takes time proportional to the path length. The fields are kept in a least recently used cache
+#and can also be stored in a directory, from which they are memory-mapped when needed again.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class DistanceFieldCache:
+    #<summary>Creates an empty cache.</summary>
+    #<param name='compactGrid'>A 'compactgrid.CompactGrid' object describing the world.</param>
+    #<param name='capacity'>The maximum number of fields kept in memory.</param>
+    #<param name='directory'>A directory in which the fields are stored or 'None' if they should only be kept in memory.</param>
+    def __init__(self, compactGrid, capacity=8, directory=None):
+        self.grid = compactGrid
+        self.capacity = capacity
+        self.directory = directory
+        self.fields = OrderedDict()
+
+        #the distances can't be longer than the number of cells,
+        #so small worlds use 16 bit distances
+        self.dtype = numpy.uint32
+        if compactGrid.numberOfRows * compactGrid.stride < numpy.iinfo(numpy.uint16).max:
+            self.dtype = numpy.uint16
+        self.unreached = numpy.iinfo(self.dtype).max
+
+        #the stored fields are only valid for the world they were computed for
+        self.worldDigest = None
+        if directory is not None:
+            self.worldDigest = hashlib.md5(self.grid.buffer[:]).hexdigest()
+
+    #<summary>Returns the distance field of a number of goals, computing it if it is not cached.</summary>
+    #<param name='goals'>A list of 'grid.Coordinates' objects.</param>
+    #<returns>A flat numpy array indexed by cell id; cells from which the goals cannot be reached
+    #have the largest value of the array type.
+    #</returns>
+    def distanceField(self, goals):
+        #blocked goals can't be reached, so they are not used as sources
+        goalCells = set([self.grid.cellId(goal.getRow(), goal.getColumn()) for goal in goals])
+        goalCells = tuple(sorted([cell for cell in goalCells if not self.grid.isBlocked(cell)]))
+        if goalCells in self.fields:
+            field = self.fields.pop(goalCells)
+            self.fields[goalCells] = field
+            return field
+
+        fileName = None
+        if self.directory is not None:
+            goalsDigest = hashlib.md5(str(goalCells)).hexdigest()
+            fileName = os.path.join(self.directory, 'field_' + self.worldDigest + '_' + goalsDigest + '.npy')
+
+        if fileName is not None and os.path.exists(fileName):
+            field = numpy.load(fileName, mmap_mode='r')
+        else:
+            field = self.grid.distanceField(list(goalCells), self.dtype)
+            if fileName is not None:
+                numpy.save(fileName, field)
+
+        self.fields[goalCells] = field
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    #<summary>Finds a shortest path from a position to the closest of a number of goals by
+    #repeatedly moving to a neighbour that is one step closer to the goals.
+    #</summary>
+    #<param name='start'>A 'grid.Coordinates' object that stores the start position.</param>
+    #<param name='goals'>A list of 'grid.Coordinates' objects.</param>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions along the path (including
+    #the start and the goal position) or an empty list if no goal can be reached.
+    #</returns>
+    def findPath(self, start, goals):
+        field = self.distanceField(goals)
+        currentCell = self.grid.cellId(start.getRow(), start.getColumn())
+        if field[currentCell] == self.unreached:
+            return []
+
+        path = [self.grid.coordinates(currentCell)]
+        distance = int(field[currentCell])
+        while distance > 0:
+            for neighbour in self.grid.neighbours(currentCell):
+                if field[neighbour] == distance - 1:
+                    currentCell = neighbour
+                    break
+            path.append(self.grid.coordinates(currentCell))
+            distance -= 1
+        return path
+
+    #<summary>Removes all fields from memory; has to be called after the world has changed.</summary>
+    def clear(self):
+        self.fields.clear()
+        if self.directory is not None:
+            self.worldDigest = hashlib.md5(self.grid.buffer[:]).hexdigest()
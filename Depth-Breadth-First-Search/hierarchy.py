@@ -0,0 +1,369 @@
+from collections import deque
+import heapq
+
+#<summary>Defines a hierarchical abstraction of a grid world (HPA*) for answering long-range path queries.
+#The world is partitioned into square clusters; the free cell pairs along the border
+#between two clusters form entrances, each of which is represented by one or two transitions
+#between the clusters. The cells of the transitions are the nodes of a small abstract
+#graph, whose edges are the transitions themselves and the distances between the nodes
+#of each cluster. A query is answered on the abstract graph and then refined into a
+#path of grid cells, one cluster at a time; the paths are close to, but not always, optimal.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class HierarchicalMap:
+    #<summary>Partitions a world into clusters and builds the abstract graph.</summary>
+    #<param name='compactGrid'>A 'compactgrid.CompactGrid' object describing the world; the abstraction keeps a reference to it.</param>
+    #<param name='clusterSize'>The number of rows and columns of a cluster.</param>
+    def __init__(self, compactGrid, clusterSize=16):
+        self.grid = compactGrid
+        self.clusterSize = clusterSize
+        self.numberOfClusterRows = (compactGrid.numberOfRows + clusterSize - 1) / clusterSize
+        self.numberOfClusterColumns = (compactGrid.numberOfColumns + clusterSize - 1) / clusterSize
+
+        #'transitions' maps a border to a list of (cell, cell) pairs that cross it, 'interEdges' maps
+        #an abstract node to the nodes across the borders, and 'intraEdges' maps a cluster to
+        #a dictionary that stores the distances between each pair of connected nodes of the cluster
+        self.transitions = dict()
+        self.interEdges = dict()
+        self.intraEdges = dict()
+        self.freeTable = None
+
+        for clusterRow in range(self.numberOfClusterRows):
+            for clusterColumn in range(self.numberOfClusterColumns):
+                cluster = (clusterRow, clusterColumn)
+                for border in [self._rightBorder(cluster), self._bottomBorder(cluster)]:
+                    if border is not None:
+                        self._findTransitions(border)
+
+        for clusterRow in range(self.numberOfClusterRows):
+            for clusterColumn in range(self.numberOfClusterColumns):
+                self._connectClusterNodes((clusterRow, clusterColumn))
+
+    #<summary>Finds a path between two positions in the world.</summary>
+    #<param name='start'>A 'grid.Coordinates' object that stores the start position.</param>
+    #<param name='goal'>A 'grid.Coordinates' object that stores the goal position.</param>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions along the path (including
+    #the start and the goal position) or an empty list if the goal cannot be reached.
+    #</returns>
+    def findPath(self, start, goal):
+        startCell = self.grid.cellId(start.getRow(), start.getColumn())
+        goalCell = self.grid.cellId(goal.getRow(), goal.getColumn())
+        if self.grid.isBlocked(startCell) or self.grid.isBlocked(goalCell):
+            return []
+
+        abstractPath = self._findAbstractPath(startCell, goalCell)
+        if len(abstractPath) == 0:
+            return []
+
+        #consecutive nodes of the abstract path are either neighbours
+        #across a border or are connected within a cluster
+        path = [startCell]
+        for i in range(1, len(abstractPath)):
+            previousCell = abstractPath[i-1]
+            nextCell = abstractPath[i]
+            if nextCell in self.grid.neighbours(previousCell) and self._cluster(nextCell) != self._cluster(previousCell):
+                path.append(nextCell)
+            else:
+                distances, parents = self._searchCluster(previousCell, nextCell)
+                localPath = []
+                currentCell = nextCell
+                while currentCell != previousCell:
+                    localPath.append(currentCell)
+                    currentCell = parents[currentCell]
+                path.extend(localPath[::-1])
+
+        positions = []
+        for cell in path:
+            positions.append(self.grid.coordinates(cell))
+        return positions
+
+    #<summary>Changes the marker of a cell in the world and updates the abstraction. Only the
+    #cluster of the cell is recomputed; if the cell lies on a cluster border, the transitions
+    #across that border change as well, so the clusters on the other side are also reconnected.
+    #</summary>
+    #<param name='position'>A 'grid.Coordinates' object.</param>
+    #<param name='marker'>The new marker of the cell.</param>
+    def setCell(self, position, marker):
+        cell = self.grid.cellId(position.getRow(), position.getColumn())
+        self.grid.setMarker(cell, marker)
+
+        cluster = self._cluster(cell)
+        clustersToConnect = set([cluster])
+        for border, otherCluster in self._bordersOfCell(cell):
+            self._removeTransitions(border)
+            self._findTransitions(border)
+            clustersToConnect.add(otherCluster)
+
+        for clusterToConnect in clustersToConnect:
+            self._connectClusterNodes(clusterToConnect)
+
+    #<param name='cell'>The id of a cell.</param>
+    #<returns>A (cluster row, cluster column) tuple identifying the cluster of the cell.</returns>
+    def _cluster(self, cell):
+        row, column = divmod(cell, self.grid.stride)
+        return (row / self.clusterSize, column / self.clusterSize)
+
+    #<param name='cluster'>A (cluster row, cluster column) tuple.</param>
+    #<returns>The first row, the first column, the last row, and the last column of the cluster.</returns>
+    def _clusterBounds(self, cluster):
+        firstRow = cluster[0] * self.clusterSize
+        firstColumn = cluster[1] * self.clusterSize
+        lastRow = min(firstRow + self.clusterSize, self.grid.numberOfRows) - 1
+        lastColumn = min(firstColumn + self.clusterSize, self.grid.numberOfColumns) - 1
+        return firstRow, firstColumn, lastRow, lastColumn
+
+    #<param name='cluster'>A (cluster row, cluster column) tuple.</param>
+    #<returns>The border between the cluster and the cluster to its right or 'None' if there is no such cluster.</returns>
+    def _rightBorder(self, cluster):
+        if cluster[1] + 1 < self.numberOfClusterColumns:
+            return ('vertical', cluster)
+        return None
+
+    #<param name='cluster'>A (cluster row, cluster column) tuple.</param>
+    #<returns>The border between the cluster and the cluster below it or 'None' if there is no such cluster.</returns>
+    def _bottomBorder(self, cluster):
+        if cluster[0] + 1 < self.numberOfClusterRows:
+            return ('horizontal', cluster)
+        return None
+
+    #<param name='cluster'>A (cluster row, cluster column) tuple.</param>
+    #<returns>A list of all borders of the cluster.</returns>
+    def _clusterBorders(self, cluster):
+        borders = [self._rightBorder(cluster), self._bottomBorder(cluster)]
+        if cluster[1] > 0:
+            borders.append(('vertical', (cluster[0], cluster[1] - 1)))
+        if cluster[0] > 0:
+            borders.append(('horizontal', (cluster[0] - 1, cluster[1])))
+        return [border for border in borders if border is not None]
+
+    #<summary>Finds the borders that a cell lies on.</summary>
+    #<param name='cell'>The id of a cell.</param>
+    #<returns>A list of (border, cluster on the other side) tuples.</returns>
+    def _bordersOfCell(self, cell):
+        row, column = divmod(cell, self.grid.stride)
+        cluster = self._cluster(cell)
+        firstRow, firstColumn, lastRow, lastColumn = self._clusterBounds(cluster)
+
+        borders = []
+        if column == lastColumn and self._rightBorder(cluster) is not None:
+            borders.append((self._rightBorder(cluster), (cluster[0], cluster[1] + 1)))
+        if row == lastRow and self._bottomBorder(cluster) is not None:
+            borders.append((self._bottomBorder(cluster), (cluster[0] + 1, cluster[1])))
+        if column == firstColumn and cluster[1] > 0:
+            otherCluster = (cluster[0], cluster[1] - 1)
+            borders.append((('vertical', otherCluster), otherCluster))
+        if row == firstRow and cluster[0] > 0:
+            otherCluster = (cluster[0] - 1, cluster[1])
+            borders.append((('horizontal', otherCluster), otherCluster))
+        return borders
+
+    #<summary>Finds the transitions across a border. Each maximal run of free cell pairs
+    #along the border is an entrance; short entrances get one transition in the middle
+    #and longer ones get a transition at each end.
+    #</summary>
+    #<param name='border'>A (direction, cluster) tuple, where the cluster is left of or above the border.</param>
+    def _findTransitions(self, border):
+        direction, cluster = border
+        firstRow, firstColumn, lastRow, lastColumn = self._clusterBounds(cluster)
+
+        #'step' moves along the border and 'crossing' moves across it
+        if direction == 'vertical':
+            firstCell = self.grid.cellId(firstRow, lastColumn)
+            borderLength = lastRow - firstRow + 1
+            step = self.grid.stride
+            crossing = 1
+        else:
+            firstCell = self.grid.cellId(lastRow, firstColumn)
+            borderLength = lastColumn - firstColumn + 1
+            step = 1
+            crossing = self.grid.stride
+
+        transitions = []
+        entranceStart = -1
+        for i in range(borderLength + 1):
+            cell = firstCell + i * step
+            isOpen = i < borderLength and not self.grid.isBlocked(cell) and not self.grid.isBlocked(cell + crossing)
+            if isOpen and entranceStart == -1:
+                entranceStart = i
+            elif not isOpen and entranceStart != -1:
+                entranceLength = i - entranceStart
+                if entranceLength < 6:
+                    positions = [entranceStart + entranceLength / 2]
+                else:
+                    positions = [entranceStart, i - 1]
+
+                for position in positions:
+                    transitionCell = firstCell + position * step
+                    transitions.append((transitionCell, transitionCell + crossing))
+                entranceStart = -1
+
+        self.transitions[border] = transitions
+        for cell1, cell2 in transitions:
+            self.interEdges.setdefault(cell1, set()).add(cell2)
+            self.interEdges.setdefault(cell2, set()).add(cell1)
+
+    #<summary>Removes the transitions across a border.</summary>
+    #<param name='border'>A (direction, cluster) tuple.</param>
+    def _removeTransitions(self, border):
+        for cell1, cell2 in self.transitions.pop(border, []):
+            for cell, otherCell in [(cell1, cell2), (cell2, cell1)]:
+                self.interEdges[cell].discard(otherCell)
+                if len(self.interEdges[cell]) == 0:
+                    del self.interEdges[cell]
+
+    #<param name='cluster'>A (cluster row, cluster column) tuple.</param>
+    #<returns>A set of the abstract nodes that lie in the cluster.</returns>
+    def _clusterNodes(self, cluster):
+        nodes = set()
+        for border in self._clusterBorders(cluster):
+            for cell1, cell2 in self.transitions.get(border, []):
+                for cell in [cell1, cell2]:
+                    if self._cluster(cell) == cluster:
+                        nodes.add(cell)
+        return nodes
+
+    #<summary>Computes the distances between all abstract nodes of a cluster. The searches run on
+    #a local copy of the cluster surrounded by blocked cells, so that they don't need any bounds checks.
+    #</summary>
+    #<param name='cluster'>A (cluster row, cluster column) tuple.</param>
+    def _connectClusterNodes(self, cluster):
+        firstRow, firstColumn, lastRow, lastColumn = self._clusterBounds(cluster)
+        width = lastColumn - firstColumn + 3
+        height = lastRow - firstRow + 3
+
+        free = bytearray(width * height)
+        for row in range(firstRow, lastRow + 1):
+            firstCell = self.grid.cellId(row, firstColumn)
+            localCell = (row - firstRow + 1) * width + 1
+            rowCells = bytearray(self.grid.buffer[firstCell:firstCell + lastColumn - firstColumn + 1])
+            free[localCell:localCell + len(rowCells)] = rowCells.translate(self._freeTable())
+
+        nodes = list(self._clusterNodes(cluster))
+        localNodes = []
+        for node in nodes:
+            row, column = divmod(node, self.grid.stride)
+            localNodes.append((row - firstRow + 1) * width + column - firstColumn + 1)
+
+        edges = dict()
+        for node in nodes:
+            edges[node] = dict()
+
+        #the distances are symmetric, so each search only
+        #looks for the nodes that come after its start node
+        steps = [width, -width, 1, -1]
+        for i in range(len(nodes) - 1):
+            distances = [-1] * (width * height)
+            distances[localNodes[i]] = 0
+            queue = deque([localNodes[i]])
+            while len(queue) > 0:
+                currentCell = queue.popleft()
+                for step in steps:
+                    neighbour = currentCell + step
+                    if free[neighbour] and distances[neighbour] == -1:
+                        distances[neighbour] = distances[currentCell] + 1
+                        queue.append(neighbour)
+
+            for j in range(i + 1, len(nodes)):
+                if distances[localNodes[j]] != -1:
+                    edges[nodes[i]][nodes[j]] = distances[localNodes[j]]
+                    edges[nodes[j]][nodes[i]] = distances[localNodes[j]]
+
+        self.intraEdges[cluster] = edges
+
+    #<returns>A translation table that maps each cell marker to 1 if the cell is free and to 0 otherwise.</returns>
+    def _freeTable(self):
+        if self.freeTable is None:
+            self.freeTable = ''.join([chr(1 - blocked) for blocked in self.grid.blocked])
+        return self.freeTable
+
+    #<summary>Runs a breadth-first search that doesn't leave the cluster of the start cell.</summary>
+    #<param name='startCell'>The id of the start cell.</param>
+    #<param name='goalCell'>The id of a cell at which the search can stop or -1 to search the whole cluster.</param>
+    #<returns>A tuple of two dictionaries, which map each reached cell to its distance and to its parent cell.</returns>
+    def _searchCluster(self, startCell, goalCell=-1):
+        firstRow, firstColumn, lastRow, lastColumn = self._clusterBounds(self._cluster(startCell))
+        stride = self.grid.stride
+
+        distances = {startCell: 0}
+        parents = {startCell: -1}
+        queue = deque([startCell])
+        while len(queue) > 0:
+            currentCell = queue.popleft()
+            if currentCell == goalCell:
+                break
+
+            for neighbour in self.grid.neighbours(currentCell):
+                row, column = divmod(neighbour, stride)
+                if neighbour not in distances and firstRow <= row <= lastRow and firstColumn <= column <= lastColumn:
+                    distances[neighbour] = distances[currentCell] + 1
+                    parents[neighbour] = currentCell
+                    queue.append(neighbour)
+
+        return distances, parents
+
+    #<summary>Finds a path on the abstract graph, to which the start and the goal cell are temporarily
+    #connected through the abstract nodes of their clusters.
+    #</summary>
+    #<param name='startCell'>The id of the start cell.</param>
+    #<param name='goalCell'>The id of the goal cell.</param>
+    #<returns>A list of cell ids from the start to the goal cell or an empty list if there is no path.</returns>
+    def _findAbstractPath(self, startCell, goalCell):
+        startDistances, parents = self._searchCluster(startCell)
+        goalDistances, parents = self._searchCluster(goalCell)
+        goalCluster = self._cluster(goalCell)
+        stride = self.grid.stride
+        goalRow, goalColumn = divmod(goalCell, stride)
+
+        #the goal can be reached from the nodes of its cluster that
+        #are connected to it and, possibly, directly from the start
+        goalEdges = dict()
+        for node in self._clusterNodes(goalCluster):
+            if node in goalDistances:
+                goalEdges[node] = goalDistances[node]
+
+        startEdges = dict()
+        for node in self._clusterNodes(self._cluster(startCell)):
+            if node in startDistances:
+                startEdges[node] = startDistances[node]
+        if goalCell in startDistances:
+            startEdges[goalCell] = startDistances[goalCell]
+
+        #A* on the abstract graph with a Manhattan distance heuristic
+        openList = [(0, 0, startCell)]
+        costs = {startCell: 0}
+        abstractParents = {startCell: -1}
+        closedNodes = set()
+        while len(openList) > 0:
+            currentNode = heapq.heappop(openList)[2]
+            if currentNode in closedNodes:
+                continue
+            closedNodes.add(currentNode)
+            if currentNode == goalCell:
+                break
+
+            if currentNode == startCell:
+                edges = startEdges.items()
+            else:
+                edges = self.intraEdges[self._cluster(currentNode)].get(currentNode, dict()).items()
+            edges = edges + [(otherNode, 1) for otherNode in self.interEdges.get(currentNode, [])]
+            if currentNode in goalEdges:
+                edges.append((goalCell, goalEdges[currentNode]))
+
+            for otherNode, edgeCost in edges:
+                cost = costs[currentNode] + edgeCost
+                if otherNode not in costs or cost < costs[otherNode]:
+                    costs[otherNode] = cost
+                    abstractParents[otherNode] = currentNode
+                    row, column = divmod(otherNode, stride)
+                    totalCost = cost + abs(row - goalRow) + abs(column - goalColumn)
+                    heapq.heappush(openList, (totalCost, -cost, otherNode))
+
+        if goalCell not in closedNodes:
+            return []
+
+        path = []
+        currentNode = goalCell
+        while currentNode != -1:
+            path.append(currentNode)
+            currentNode = abstractParents[currentNode]
+        return path[::-1]
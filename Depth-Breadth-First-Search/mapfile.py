@@ -0,0 +1,73 @@
+import mmap
+
+#<summary>Gives access to a map stored in a text file without reading the file into memory.
+#The file is memory-mapped and its rows are exposed as zero-copy views, so
+#the map can be used wherever a list of row strings is expected; the
+#markers are only decoded when the corresponding cells are accessed.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class MappedWorld:
+    #<summary>Memory-maps a map file and finds the beginning of each row.</summary>
+    #<param name='fileName'>Name of the map file.</param>
+    def __init__(self, fileName):
+        #the mapping is copy-on-write, so changes to the cells
+        #are never written back to the map file
+        mapFile = open(fileName, 'rb')
+        self.buffer = mmap.mmap(mapFile.fileno(), 0, access=mmap.ACCESS_COPY)
+        mapFile.close()
+
+        self.rowStarts = []
+        self.rowLengths = []
+        self.lineBreaks = 0
+
+        rowStart = 0
+        fileSize = len(self.buffer)
+        while rowStart < fileSize:
+            rowEnd = self.buffer.find('\n', rowStart)
+            nextRowStart = rowEnd + 1
+            if rowEnd == -1:
+                rowEnd = fileSize
+                nextRowStart = fileSize
+
+            #'\r' characters of Windows line breaks don't belong to the row
+            if rowEnd > rowStart and self.buffer[rowEnd-1] == '\r':
+                rowEnd -= 1
+                self.lineBreaks += 1
+
+            self.rowStarts.append(rowStart)
+            self.rowLengths.append(rowEnd - rowStart)
+            rowStart = nextRowStart
+
+        #empty lines at the end of the file are not part of the map
+        while len(self.rowLengths) > 0 and self.rowLengths[-1] == 0:
+            self.rowStarts.pop()
+            self.rowLengths.pop()
+
+    #<returns>The number of rows in the map.</returns>
+    def __len__(self):
+        return len(self.rowStarts)
+
+    #<summary>Returns a row of the map.</summary>
+    #<param name='row'>A number denoting grid row.</param>
+    #<returns>A read-only zero-copy view of the row, which can be indexed like a string.</returns>
+    def __getitem__(self, row):
+        return buffer(self.buffer, self.rowStarts[row], self.rowLengths[row])
+
+    #<summary>Checks whether the file itself can be used as a flat grid, i.e. if
+    #all rows have the same length and are separated by single '\n' characters.
+    #</summary>
+    #<returns>The distance between the beginnings of two consecutive rows or -1 if the layout is not uniform.</returns>
+    def uniformStride(self):
+        if len(self.rowStarts) == 0 or self.lineBreaks > 0:
+            return -1
+
+        stride = self.rowLengths[0] + 1
+        for row in range(len(self.rowStarts)):
+            if self.rowLengths[row] != stride - 1 or self.rowStarts[row] != row * stride:
+                return -1
+
+        #the file may only end with the separator of the last row
+        if len(self.buffer) > len(self.rowStarts) * stride:
+            return -1
+
+        return stride
@@ -0,0 +1,104 @@
+import numpy
+
+#<summary>Plans the order in which a robot visits the reachable dirt locations of a map.
+#The distances between the start position and all reachable dirt locations are
+#computed once per map and reused by all planning calls.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class CleaningPlanner:
+    #<summary>Creates a new planner.</summary>
+    #<param name='searchLibrary'>A 'search.SearchLibrary' object describing the map.</param>
+    def __init__(self, searchLibrary):
+        self.grid = searchLibrary.grid
+        self.goalMarker = searchLibrary.goalMarker
+        self.startCell = searchLibrary._findStartCell()
+
+        #'cells' stores the start cell followed by the reachable dirt cells
+        #and 'distances' stores the distances between them; both are
+        #computed the first time they are needed
+        self.cells = None
+        self.distances = None
+
+    #<summary>Computes the distances between the start position and all reachable dirt locations,
+    #running one breadth-first search from the start and one from each dirt location.
+    #</summary>
+    #<returns>A square numpy array of distances; the first row and column belong to the start position
+    #and the others to the dirt locations returned by 'dirtPositions'.
+    #</returns>
+    def distanceMatrix(self):
+        if self.distances is not None:
+            return self.distances
+
+        startDistances = self.grid.distanceField([self.startCell])
+        unreached = numpy.iinfo(startDistances.dtype).max
+        dirtCells = numpy.array(self.grid.findAllMarkers(self.goalMarker), dtype=numpy.int64)
+        dirtCells = dirtCells[startDistances[dirtCells] != unreached]
+
+        self.cells = numpy.concatenate(([self.startCell], dirtCells))
+        self.distances = numpy.empty((len(self.cells), len(self.cells)), dtype=startDistances.dtype)
+        self.distances[0] = startDistances[self.cells]
+        for i in range(1, len(self.cells)):
+            self.distances[i] = self.grid.distanceField([self.cells[i]])[self.cells]
+
+        return self.distances
+
+    #<returns>A list of 'grid.Coordinates' objects that store the reachable dirt locations, in the order used by 'distanceMatrix'.</returns>
+    def dirtPositions(self):
+        self.distanceMatrix()
+        positions = []
+        for cell in self.cells[1:]:
+            positions.append(self.grid.coordinates(int(cell)))
+        return positions
+
+    #<summary>Plans a short tour that starts at the start position and visits a number of dirt locations.
+    #The tour is built by repeatedly moving to the closest unvisited location and is then improved
+    #by reversing parts of it (2-opt) as long as that makes it shorter.
+    #</summary>
+    #<param name='dirtIndices'>Indices (into 'dirtPositions') of the locations that should be visited;
+    #all reachable dirt locations are visited if this is 'None'.
+    #</param>
+    #<returns>A list of indices into 'dirtPositions' in visiting order.</returns>
+    def planTour(self, dirtIndices=None):
+        distances = self.distanceMatrix()
+        if dirtIndices is None:
+            dirtIndices = range(len(self.cells) - 1)
+
+        #the tour is planned over the rows of the distance matrix, where 0 is the start position
+        unvisited = set([index + 1 for index in dirtIndices])
+        distances = distances.astype(numpy.int64).tolist()
+
+        tour = [0]
+        while len(unvisited) > 0:
+            currentDistances = distances[tour[-1]]
+            closest = min(unvisited, key=lambda point: currentDistances[point])
+            tour.append(closest)
+            unvisited.remove(closest)
+
+        #the tour doesn't return to the start position, so the last
+        #point of a reversed part doesn't have a following point
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(tour) - 1):
+                for j in range(i + 1, len(tour)):
+                    change = distances[tour[i-1]][tour[j]] - distances[tour[i-1]][tour[i]]
+                    if j + 1 < len(tour):
+                        change += distances[tour[i]][tour[j+1]] - distances[tour[j]][tour[j+1]]
+
+                    if change < 0:
+                        tour[i:j+1] = tour[i:j+1][::-1]
+                        improved = True
+
+        return [point - 1 for point in tour[1:]]
+
+    #<summary>Calculates the length of a tour that starts at the start position.</summary>
+    #<param name='tour'>A list of indices into 'dirtPositions' in visiting order.</param>
+    #<returns>The number of moves needed to visit the locations in the given order.</returns>
+    def tourLength(self, tour):
+        distances = self.distanceMatrix()
+        length = 0
+        previousPoint = 0
+        for index in tour:
+            length += int(distances[previousPoint, index + 1])
+            previousPoint = index + 1
+        return length
@@ -0,0 +1,102 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.animation as animation
+import matplotlib.pyplot as pyplot
+import numpy
+
+#<summary>Replays a recorded grid search, either in an interactive figure
+#or offscreen as a video or a sequence of images.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class TraceRenderer:
+    #<summary>Creates a new renderer.</summary>
+    #<param name='compactGrid'>A 'compactgrid.CompactGrid' object describing the searched world.</param>
+    #<param name='searchTrace'>A 'searchtrace.SearchTrace' object recorded during the search.</param>
+    def __init__(self, compactGrid, searchTrace):
+        self.grid = compactGrid
+        self.trace = searchTrace
+
+        #the trace is converted to numpy arrays of [column, row] positions
+        #once, so that drawing a frame doesn't require any loops
+        expandedCells = numpy.frombuffer(searchTrace.expandedCells, dtype=numpy.dtype('l'))
+        rows, columns = numpy.divmod(expandedCells, compactGrid.stride)
+        self.expandedPositions = numpy.column_stack((columns, rows))
+        self.goalSteps = numpy.frombuffer(searchTrace.goalSteps, dtype=numpy.dtype('l'))
+
+        #the separators after the rows are not drawn as obstacles
+        obstacleRows, obstacleColumns = numpy.nonzero(~compactGrid.freeMask()[:, :compactGrid.numberOfColumns])
+        self.obstacles = numpy.column_stack((obstacleColumns, obstacleRows))
+
+    #<summary>Replays the search in an interactive figure.</summary>
+    #<param name='framesPerSecond'>The number of frames drawn per second.</param>
+    #<param name='stepsPerFrame'>The number of expanded nodes shown in each frame.</param>
+    def replay(self, framesPerSecond=30., stepsPerFrame=1):
+        figure = pyplot.figure(1)
+        figure.clf()
+
+        #'pause' shows the figure without blocking the
+        #flow of the rest of the code until the frame is over
+        for step in self._frameSteps(figure, stepsPerFrame):
+            pyplot.pause(1. / framesPerSecond)
+
+    #<summary>Renders the search offscreen and saves it as a video; requires a movie writer supported by matplotlib, such as ffmpeg.</summary>
+    #<param name='fileName'>Name of the video file.</param>
+    #<param name='framesPerSecond'>The number of frames per second of the video.</param>
+    #<param name='stepsPerFrame'>The number of expanded nodes shown in each frame.</param>
+    #<param name='writerName'>Name of the matplotlib movie writer.</param>
+    def exportVideo(self, fileName, framesPerSecond=30., stepsPerFrame=1, writerName='ffmpeg'):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        writer = animation.writers[writerName](fps=framesPerSecond)
+
+        with writer.saving(figure, fileName, figure.dpi):
+            for step in self._frameSteps(figure, stepsPerFrame):
+                writer.grab_frame()
+
+    #<summary>Renders the search offscreen and saves each frame as an image.</summary>
+    #<param name='fileNamePattern'>A pattern that is formatted with the frame number, such as 'frames/frame%05d.png'.</param>
+    #<param name='stepsPerFrame'>The number of expanded nodes shown in each frame.</param>
+    #<returns>The number of saved images.</returns>
+    def exportImages(self, fileNamePattern, stepsPerFrame=1):
+        figure = Figure()
+        FigureCanvasAgg(figure)
+
+        numberOfFrames = 0
+        for step in self._frameSteps(figure, stepsPerFrame):
+            figure.savefig(fileNamePattern % numberOfFrames)
+            numberOfFrames += 1
+        return numberOfFrames
+
+    #<summary>Draws the obstacles once and then updates the current position
+    #and the explored goal nodes for each frame.
+    #</summary>
+    #<param name='figure'>The figure to draw on.</param>
+    #<param name='stepsPerFrame'>The number of expanded nodes shown in each frame.</param>
+    #<returns>A generator that yields the last step shown after each frame has been drawn.</returns>
+    def _frameSteps(self, figure, stepsPerFrame):
+        axes = figure.add_subplot(111)
+
+        #we plot the obstacles
+        axes.plot(self.obstacles[..., 0], self.obstacles[..., 1], 'ko', label='obstacles')
+        goalsLine, = axes.plot([], [], 'b*', label='goals')
+        currentLine, = axes.plot([], [], 'ro', label='current position')
+
+        #we set a legend above the plot
+        axes.legend(bbox_to_anchor=(0., 1.02, 1., .102), loc=3, ncol=3, mode="expand", borderaxespad=0.)
+
+        #we set the range of the axes and invert the y axis
+        #because we want it to grow from top to bottom
+        axes.axis([0, self.grid.numberOfColumns, 0, self.grid.numberOfRows])
+        axes.invert_yaxis()
+
+        numberOfSteps = len(self.expandedPositions)
+        for step in range(stepsPerFrame - 1, numberOfSteps + stepsPerFrame - 1, stepsPerFrame):
+            step = min(step, numberOfSteps - 1)
+
+            numberOfGoals = numpy.searchsorted(self.goalSteps, step, side='right')
+            goalPositions = self.expandedPositions[self.goalSteps[:numberOfGoals]]
+            goalsLine.set_data(goalPositions[..., 0], goalPositions[..., 1])
+            currentLine.set_data([self.expandedPositions[step, 0]], [self.expandedPositions[step, 1]])
+
+            figure.canvas.draw()
+            yield step
@@ -1,6 +1,10 @@
 import grid
+import compactgrid
+import replay
+import searchtrace
+from array import array
 from collections import deque
-import matplotlib.pyplot as pyplot
+import heapq
 import numpy
 
 #<summary>Defines a grid search library.</summary>
@@ -11,7 +15,7 @@ class SearchLibrary:
     #<param name='startMarker'>A character defining the starting search position in the map.</param>
     #<param name='obstacleMarkers'>A list of characters defining the obstacle markers in the world.</param>
     #<param name='goalMarker'>A character defining a goal position.</param>
-    #<param name='visualize'>If set to 'True', the search algorithm will be visualized.</param>
+    #<param name='visualize'>If set to 'True', the search algorithm will be recorded and replayed after it finishes.</param>
     def __init__(self, world, startMarker, obstacleMarkers, goalMarker, visualize = True):
         self.worldConfiguration = world
         self.startMarker = startMarker
@@ -25,38 +29,32 @@ class SearchLibrary:
         self.numberOfRows = len(world)
         self.numberOfColumns = len(world[0])
 
-        #used for visualization purposes, in order to
-        #avoid recomputing the obstacle positions
-        #each time the figure will be refreshed
-        self.obstacles = self._findObstaclePositions()
-
-    #<summary>Finds the coordinates of the obstacle positions in the world.</summary>
-    #<returns>A numpy array of [row, column] coordinates.</returns>
-    def _findObstaclePositions(self):
-        obstacles = []
-	for i in range(self.numberOfRows):
-            for j in range(self.numberOfColumns):
-                if self.worldConfiguration[i][j] in self.obstacleMarkers:
-                    obstacles.append([j, i])
-        return numpy.array(obstacles) 
+        #a flat representation of the world that is used by the
+        #search algorithms; cells are addressed by integer ids
+        self.grid = compactgrid.CompactGrid(world, obstacleMarkers)
+
+        #the trace of the last depth- or breadth-first search;
+        #only recorded if the search is visualized
+        self.trace = None
+
+        #the number of nodes expanded by the last search
+        self.numberOfExpandedNodes = 0
+
+        #the travel costs of the cells found by the last weighted search
+        self.travelCosts = None
 
     #<summary>Looks for the position where the search should start.</summary>
     #<returns>A 'grid.Coordinates' object that stores the position of the starting search position.</returns>
     def _findStartPosition(self):
-        startFound = False
-        startPosition = grid.Coordinates()
-
-        for i in range(self.numberOfRows):
-            for j in range(self.numberOfColumns):
-                if self.worldConfiguration[i][j] == self.startMarker:
-                    startPosition.row = i
-                    startPosition.column = j
-                    startFound = True
-                    break
-            if startFound:
-                break
+        return self.grid.coordinates(self._findStartCell())
 
-        return startPosition
+    #<summary>Looks for the cell where the search should start.</summary>
+    #<returns>The id of the starting cell; the first cell is used if there is no start marker in the world.</returns>
+    def _findStartCell(self):
+        startCell = self.grid.findMarker(self.startMarker)
+        if startCell == -1:
+            startCell = 0
+        return startCell
 
     #<summary>Finds all the neighbours of a node; takes into account
     #         the constraint that diagonal movements are not allowed.
@@ -64,152 +62,520 @@ class SearchLibrary:
     #<param name='currentNode'>The node whose neighbours we want to find.</param>
     #<returns>A list of 'grid.Coordinates' objects.</returns>
     def _generateNeighbours(self, currentNode):
-        row = currentNode.getRow()
-        column = currentNode.getColumn()
+        cell = self.grid.cellId(currentNode.getRow(), currentNode.getColumn())
         neighbours = []
-
-        #we take the node down if it is not an obstacle and doesn't go out of bounds
-        if row + 1 < self.numberOfRows and self.worldConfiguration[row+1][column] not in self.obstacleMarkers:
-            newCoordinates = grid.Coordinates(row + 1, column)
-            neighbours.append(newCoordinates)
-
-        #we take the node up if it is not an obstacle and doesn't go out of bounds
-        if row - 1 > -1 and self.worldConfiguration[row-1][column] not in self.obstacleMarkers:
-            newCoordinates = grid.Coordinates(row - 1, column)
-            neighbours.append(newCoordinates)
-
-        #we take the node to the right if it is not an obstacle and doesn't go out of bounds
-        if column + 1 < self.numberOfColumns and self.worldConfiguration[row][column+1] not in self.obstacleMarkers:
-            newCoordinates = grid.Coordinates(row, column + 1)
-            neighbours.append(newCoordinates)
-
-        #we take the node to the left if it is not an obstacle and doesn't go out of bounds
-        if column - 1 > -1 and self.worldConfiguration[row][column-1] not in self.obstacleMarkers:
-            newCoordinates = grid.Coordinates(row, column - 1)
-            neighbours.append(newCoordinates)
-
+        for neighbour in self.grid.neighbours(cell):
+            neighbours.append(self.grid.coordinates(neighbour))
         return neighbours
 
-    #<summary>Checks if a node has already been visited by a search algorithm.</summary>
-    #<param name='node'>The node that we want to check.</param>
-    #<param name='visitedNodes'>A list of visited nodes.</param>
-    #<returns>'True' if 'node' has already been visited and 'False' otherwise.</returns>
-    def _alreadyVisited(self, node, visitedNodes):
-        numberOfVisitedPositions = len(visitedNodes)
-        alreadyVisited = False
-
-        for i in range(numberOfVisitedPositions):
-            if visitedNodes[i] == node:
-                alreadyVisited = True
-                break
-
-        return alreadyVisited
-
-    #<summary>Visualizes the search by plotting the currently processed nodes, 
-    #the obstacles, and the explore dgoal nodes.
+    #<summary>Replays the recorded trace of the last search in an interactive figure;
+    #         does nothing if no trace was recorded (e.g. if 'visualize' is 'False').
     #</summary>
-    #<param name='currentNode'>The node currently processed by the search algorithm.</param>
-    #<param name='goalPositions'>A list of explored goal nodes.</param>
-    def _visualizeGrid(self, currentNode, goalPositions):
-        pyplot.figure(1)
-
-        #we make the figure interactive because we want to avoid
-        #blocking the flow of the rest of the code
-        pyplot.ion()
-
-        #we clear the figure before plotting
-	pyplot.clf()
-
-        #we plot the obstacles
-	pyplot.plot(self.obstacles[..., 0], self.obstacles[..., 1], 'ko', label='obstacles')
-
-        #we convert the goal positions to a numpy array (more convenient for plotting)
-        goalPositionsList = []
-	for i in range(len(goalPositions)):
-            goalPositionsList.append([goalPositions[i].getColumn(), goalPositions[i].getRow()])
-        goalPositionsArray = numpy.array(goalPositionsList)
-
-        #if we have goal nodes to plot, we do that
-        if len(goalPositionsList) > 0:
-            pyplot.plot(goalPositionsArray[..., 0], goalPositionsArray[..., 1], 'b*', label='goals')
+    #<param name='framesPerSecond'>The number of frames drawn per second.</param>
+    #<param name='stepsPerFrame'>The number of expanded nodes shown in each frame.</param>
+    def replaySearch(self, framesPerSecond=30., stepsPerFrame=1):
+        if self.trace is None:
+            return
 
-        #we plot the current node
-        pyplot.plot(currentNode.getColumn(), currentNode.getRow(), 'ro', label='current position')
-
-        #we set a legend above the plot
-	pyplot.legend(bbox_to_anchor=(0., 1.02, 1., .102), loc=3, ncol=3, mode="expand", borderaxespad=0.)
-
-        #we set the range of the axes
-        pyplot.axis([0, self.numberOfColumns, 0, self.numberOfRows])
-
-        #we invert the y axis because we want it to grow from top to bottom
-        pyplot.gca().invert_yaxis()
-
-        #we finally draw the figure
-        pyplot.draw()
+        renderer = replay.TraceRenderer(self.grid, self.trace)
+        renderer.replay(framesPerSecond, stepsPerFrame)
 
     #<summary>Explores a grid of nodes using a depth-first search strategy.</summary>
     #<returns>A list of 'grid.Coordinates' objects that store the positions of the goal nodes found.</returns>
     def depthFirstSearch(self):
-        startPosition = self._findStartPosition()
+        cells = self.grid.cells
+        goalMarker = ord(self.goalMarker)
+        startCell = self._findStartCell()
 
-        stack = [startPosition]
-        visitedNodes = [startPosition]
+        stack = [startCell]
+        visitedNodes = bytearray(self.grid.size)
+        visitedNodes[startCell] = 1
         goalPositions = []
 
+        #the search is only recorded while it runs and
+        #replayed once it's over, so that drawing doesn't slow it down
+        trace = None
+        if self.visualize:
+            trace = searchtrace.SearchTrace()
+        self.trace = trace
+        numberOfExpandedNodes = 0
+
         #as long as we have nodes to process, we take
         #the neighbours of the current node, append them to the stack,
         #and add the current node to the goal list if it is a goal node
         while len(stack) > 0:
-            currentNode = stack.pop()
+            currentCell = stack.pop()
 
-            if self.visualize:
-                self._visualizeGrid(currentNode, goalPositions)
+            isGoal = cells[currentCell] == goalMarker
+            if isGoal:
+                goalPositions.append(self.grid.coordinates(currentCell))
 
-            if self.worldConfiguration[currentNode.getRow()][currentNode.getColumn()] == self.goalMarker:
-                goalPositions.append(currentNode)
+            if trace is not None:
+                trace.expand(currentCell, isGoal)
+            numberOfExpandedNodes += 1
 
-            neighbours = self._generateNeighbours(currentNode)
-            numberOfNeighbours = len(neighbours)
+            neighbours = self.grid.neighbours(currentCell)
 
             #we only add the nodes to the stack if they have not been visited already
             while len(neighbours) > 0:
                 neighbour = neighbours.pop()
-                if not self._alreadyVisited(neighbour, visitedNodes):
+                if not visitedNodes[neighbour]:
                     stack.append(neighbour)
-                    visitedNodes.append(neighbour)
+                    visitedNodes[neighbour] = 1
+
+        self.numberOfExpandedNodes = numberOfExpandedNodes
+        if self.visualize:
+            self.replaySearch()
 
         return goalPositions
 
     #<summary>Explores a grid of nodes using a breadth-first search strategy.</summary>
     #<returns>A list of 'grid.Coordinates' objects that store the positions of the goal nodes found.</returns>
     def breadthFirstSearch(self):
-        startPosition = self._findStartPosition()
+        cells = self.grid.cells
+        goalMarker = ord(self.goalMarker)
+        startCell = self._findStartCell()
 
-        queue = deque([startPosition])
-        visitedNodes = [startPosition]
+        queue = deque([startCell])
+        visitedNodes = bytearray(self.grid.size)
+        visitedNodes[startCell] = 1
         goalPositions = []
 
+        #the search is only recorded while it runs and
+        #replayed once it's over, so that drawing doesn't slow it down
+        trace = None
+        if self.visualize:
+            trace = searchtrace.SearchTrace()
+        self.trace = trace
+        numberOfExpandedNodes = 0
+
         #as long as we have nodes to process, we take
         #the neighbours of the current node, append them to the queue,
         #and add the current node to the goal list if it is a goal node
         while len(queue) > 0:
-            currentNode = queue.popleft()
+            currentCell = queue.popleft()
 
-            if self.visualize:
-                self._visualizeGrid(currentNode, goalPositions)
+            isGoal = cells[currentCell] == goalMarker
+            if isGoal:
+                goalPositions.append(self.grid.coordinates(currentCell))
 
-            if self.worldConfiguration[currentNode.getRow()][currentNode.getColumn()] == self.goalMarker:
-                goalPositions.append(currentNode)
+            if trace is not None:
+                trace.expand(currentCell, isGoal)
+            numberOfExpandedNodes += 1
 
-            neighbours = self._generateNeighbours(currentNode)
-            numberOfNeighbours = len(neighbours)
+            neighbours = self.grid.neighbours(currentCell)
 
             #we only add the nodes to the queue if they have not been visited already
             while len(neighbours) > 0:
                 neighbour = neighbours.pop()
-                if not self._alreadyVisited(neighbour, visitedNodes):
+                if not visitedNodes[neighbour]:
                     queue.append(neighbour)
-                    visitedNodes.append(neighbour)
+                    visitedNodes[neighbour] = 1
+
+        self.numberOfExpandedNodes = numberOfExpandedNodes
+        if self.visualize:
+            self.replaySearch()
 
         return goalPositions
+
+    #<summary>Explores a grid of nodes in which moving into a cell costs a small positive integer that
+    #depends on the cell's marker (e.g. mud or carpet), visiting the nodes in order of increasing travel cost.
+    #This is Dijkstra's algorithm with a bucket (Dial) queue: since a move costs at most 'C', all
+    #tentative costs lie within 'C' of the current cost, so 'C + 1' circular buckets indexed by cost
+    #replace the binary heap and each node is inserted and removed in constant time.
+    #</summary>
+    #<param name='terrainCosts'>A dictionary that maps cell markers to move costs (positive integers); moving into cells
+    #with other markers costs 1.
+    #</param>
+    #<param name='allowDiagonalMoves'>If set to 'True', diagonal moves that don't cut obstacle corners are also allowed;
+    #they cost the same as moving into the cell horizontally or vertically.
+    #</param>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions of the reachable goal nodes,
+    #in order of increasing travel cost.
+    #</returns>
+    def weightedSearch(self, terrainCosts, allowDiagonalMoves=False):
+        cells = self.grid.cells
+        goalMarker = ord(self.goalMarker)
+        startCell = self._findStartCell()
+
+        moveCosts = [1] * 256
+        for marker, cost in terrainCosts.items():
+            moveCosts[ord(marker)] = cost
+        numberOfBuckets = max(moveCosts) + 1
+
+        #'travelCosts' stores the lowest known cost of each cell (-1 if the cell hasn't been reached);
+        #the buckets may contain outdated entries, which are skipped when their cost has been lowered
+        travelCosts = array('l', [-1]) * self.grid.size
+        travelCosts[startCell] = 0
+        buckets = [[] for i in range(numberOfBuckets)]
+        buckets[0].append(startCell)
+        numberOfQueuedNodes = 1
+        numberOfExpandedNodes = 0
+        goalPositions = []
+
+        currentCost = 0
+        while numberOfQueuedNodes > 0:
+            bucket = buckets[currentCost % numberOfBuckets]
+            while len(bucket) > 0:
+                currentCell = bucket.pop()
+                numberOfQueuedNodes -= 1
+                if travelCosts[currentCell] != currentCost:
+                    continue
+
+                numberOfExpandedNodes += 1
+                if cells[currentCell] == goalMarker:
+                    goalPositions.append(self.grid.coordinates(currentCell))
+
+                neighbours = self.grid.neighbours(currentCell)
+                if allowDiagonalMoves:
+                    neighbours.extend(self.grid.diagonalNeighbours(currentCell))
+
+                for neighbour in neighbours:
+                    cost = currentCost + moveCosts[cells[neighbour]]
+                    if travelCosts[neighbour] == -1 or cost < travelCosts[neighbour]:
+                        travelCosts[neighbour] = cost
+                        buckets[cost % numberOfBuckets].append(neighbour)
+                        numberOfQueuedNodes += 1
+            currentCost += 1
+
+        self.travelCosts = travelCosts
+        self.numberOfExpandedNodes = numberOfExpandedNodes
+        return goalPositions
+
+    #<summary>Looks up the travel cost of a position found by the last 'weightedSearch'.</summary>
+    #<param name='position'>A 'grid.Coordinates' object.</param>
+    #<returns>The lowest cost of reaching the position from the start or -1 if the position cannot be reached.</returns>
+    def travelCost(self, position):
+        return self.travelCosts[self.grid.cellId(position.getRow(), position.getColumn())]
+
+    #<summary>Finds the maximal runs of free cells along the rows of a mask.</summary>
+    #<param name='free'>A two dimensional boolean numpy array.</param>
+    #<returns>A tuple (labels, starts, lengths), where 'labels' is a flat array in which
+    #the cells of the k-th run are labelled with k and the blocked cells with 0, while 'starts'
+    #and 'lengths' store the flat index of the first cell and the length of each run.
+    #</returns>
+    def _findRuns(self, free):
+        runStarts = free.copy()
+        runStarts[:, 1:] &= ~free[:, :-1]
+        runEnds = free.copy()
+        runEnds[:, :-1] &= ~free[:, 1:]
+
+        runStarts = runStarts.ravel()
+        labels = numpy.cumsum(runStarts, dtype=numpy.int32)
+        labels[~free.ravel()] = 0
+
+        starts = numpy.flatnonzero(runStarts)
+        lengths = numpy.flatnonzero(runEnds.ravel()) - starts + 1
+        return labels, starts, lengths
+
+    #<summary>Collects the flat indices of all cells that belong to a number of runs.</summary>
+    #<param name='starts'>A numpy array of flat indices of the first cell of each run.</param>
+    #<param name='lengths'>A numpy array of run lengths.</param>
+    #<returns>A numpy array of flat indices.</returns>
+    def _gatherRuns(self, starts, lengths):
+        offsets = numpy.cumsum(lengths) - lengths
+        return numpy.repeat(starts - offsets, lengths) + numpy.arange(lengths.sum())
+
+    #<summary>Finds all goal nodes that are reachable from the start position
+    #by expanding the whole search frontier with numpy array operations.
+    #Instead of moving the frontier by one cell per step, each step expands it
+    #along all free row runs and then along all free column runs that it touches,
+    #so the number of steps depends on the number of turns along the paths rather
+    #than on their length; every run is expanded only once, which means that
+    #the total amount of work is still linear in the number of cells.
+    #</summary>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions of the
+    #reachable goal nodes, in row-major order.
+    #</returns>
+    def floodFillSearch(self):
+        free = self.grid.freeMask()
+        numberOfRows, stride = free.shape
+        rowLabels, rowStarts, rowLengths = self._findRuns(free)
+
+        #the column runs are found in the transposed mask, so that
+        #each of them also occupies a contiguous range of flat indices
+        columnLabels, columnStarts, columnLengths = self._findRuns(numpy.ascontiguousarray(free.T))
+
+        #the search starts from the run of the start cell; if the start cell
+        #is blocked, it starts from the runs of its free neighbours instead
+        startCell = self._findStartCell()
+        if free.flat[startCell]:
+            seedCells = [startCell]
+        else:
+            seedCells = self.grid.neighbours(startCell)
+
+        reachedRows = numpy.zeros(len(rowStarts) + 1, dtype=bool)
+        reachedColumns = numpy.zeros(len(columnStarts) + 1, dtype=bool)
+        frontier = numpy.unique(rowLabels[numpy.array(seedCells, dtype=numpy.int64)])
+        reachedRows[frontier] = True
+
+        while len(frontier) > 0:
+            #we expand the row runs in the frontier to the column runs that cross them
+            cells = self._gatherRuns(rowStarts[frontier-1], rowLengths[frontier-1])
+            rows, columns = numpy.divmod(cells, stride)
+            frontier = numpy.unique(columnLabels[columns * numberOfRows + rows])
+            frontier = frontier[~reachedColumns[frontier]]
+            reachedColumns[frontier] = True
+
+            #and the new column runs to the row runs that cross them
+            cells = self._gatherRuns(columnStarts[frontier-1], columnLengths[frontier-1])
+            columns, rows = numpy.divmod(cells, numberOfRows)
+            frontier = numpy.unique(rowLabels[rows * stride + columns])
+            frontier = frontier[~reachedRows[frontier]]
+            reachedRows[frontier] = True
+
+        #all cells of the reached row runs count as expanded
+        self.numberOfExpandedNodes = int(rowLengths[reachedRows[1:]].sum())
+
+        goalCells = numpy.flatnonzero(self.grid.markerMask(self.goalMarker) & free)
+        goalCells = goalCells[reachedRows[rowLabels[goalCells]]]
+
+        goalPositions = []
+        for cell in goalCells:
+            goalPositions.append(self.grid.coordinates(int(cell)))
+        return goalPositions
+
+    #<summary>Finds a shortest path from the start position to the closest of a number of goal positions
+    #by descending their distance field, which is computed once and then reused by later queries.
+    #</summary>
+    #<param name='distanceFields'>A 'distancefields.DistanceFieldCache' object created for this world.</param>
+    #<param name='goals'>A list of 'grid.Coordinates' objects that store the goal positions.</param>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions along the path (including
+    #the start and the goal position) or an empty list if no goal can be reached.
+    #</returns>
+    def distanceFieldPath(self, distanceFields, goals):
+        return distanceFields.findPath(self._findStartPosition(), goals)
+
+    #<summary>Finds a shortest path from the start position to a given goal position using
+    #bidirectional breadth-first search; the moves are the same as in '_generateNeighbours'.
+    #One search grows from the start and one from the goal; in each step, the smaller
+    #frontier is expanded by a whole level, and the searches stop at the end of the first level
+    #in which they meet, which means that both of them only explore about half the path length.
+    #</summary>
+    #<param name='goal'>A 'grid.Coordinates' object that stores the goal position.</param>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions along the path (including
+    #the start and the goal position) or an empty list if the goal cannot be reached.
+    #</returns>
+    def bidirectionalSearch(self, goal):
+        startCell = self._findStartCell()
+        goalCell = self.grid.cellId(goal.getRow(), goal.getColumn())
+        self.numberOfExpandedNodes = 0
+
+        if self.grid.isBlocked(goalCell):
+            return []
+
+        #each search keeps the parents and the distances of the cells it has reached
+        forwardParents = {startCell: -1}
+        backwardParents = {goalCell: -1}
+        forwardDistances = {startCell: 0}
+        backwardDistances = {goalCell: 0}
+        forwardFrontier = [startCell]
+        backwardFrontier = [goalCell]
+
+        #'meetingCell' is a cell reached by both searches on the shortest path found so far
+        meetingCell = -1
+        if startCell == goalCell:
+            meetingCell = startCell
+
+        while meetingCell == -1 and len(forwardFrontier) > 0 and len(backwardFrontier) > 0:
+            if len(forwardFrontier) <= len(backwardFrontier):
+                frontier, parents, distances = forwardFrontier, forwardParents, forwardDistances
+                otherDistances = backwardDistances
+            else:
+                frontier, parents, distances = backwardFrontier, backwardParents, backwardDistances
+                otherDistances = forwardDistances
+
+            nextFrontier = []
+            shortestLength = -1
+            for currentCell in frontier:
+                self.numberOfExpandedNodes += 1
+                for neighbour in self.grid.neighbours(currentCell):
+                    if neighbour in distances:
+                        continue
+
+                    parents[neighbour] = currentCell
+                    distances[neighbour] = distances[currentCell] + 1
+                    nextFrontier.append(neighbour)
+
+                    #we finish the whole level, since a later cell of the
+                    #level might still lead to a shorter connection
+                    if neighbour in otherDistances:
+                        length = distances[neighbour] + otherDistances[neighbour]
+                        if shortestLength == -1 or length < shortestLength:
+                            shortestLength = length
+                            meetingCell = neighbour
+
+            if frontier is forwardFrontier:
+                forwardFrontier = nextFrontier
+            else:
+                backwardFrontier = nextFrontier
+
+        if meetingCell == -1:
+            return []
+
+        path = []
+        currentCell = meetingCell
+        while currentCell != -1:
+            path.append(self.grid.coordinates(currentCell))
+            currentCell = forwardParents[currentCell]
+        path.reverse()
+
+        currentCell = backwardParents[meetingCell]
+        while currentCell != -1:
+            path.append(self.grid.coordinates(currentCell))
+            currentCell = backwardParents[currentCell]
+        return path
+
+    #<summary>Finds a shortest path from the start position to a given goal position
+    #using A* with a Manhattan distance heuristic. By default, the search uses
+    #jump point search, which only expands the cells where the direction
+    #of an optimal path might change, so long straight moves through open areas
+    #are skipped; plain A* expands every cell along the way.
+    #</summary>
+    #<param name='goal'>A 'grid.Coordinates' object that stores the goal position.</param>
+    #<param name='useJumpPoints'>If set to 'False', plain A* is used instead of jump point search.</param>
+    #<returns>A list of 'grid.Coordinates' objects that store the positions along the path (including
+    #the start and the goal position) or an empty list if the goal cannot be reached.
+    #</returns>
+    def shortestPath(self, goal, useJumpPoints=True):
+        startCell = self._findStartCell()
+        goalCell = self.grid.cellId(goal.getRow(), goal.getColumn())
+        goalRow, goalColumn = goal.getRow(), goal.getColumn()
+        stride = self.grid.stride
+        self.numberOfExpandedNodes = 0
+
+        if self.grid.isBlocked(goalCell):
+            return []
+
+        #the open list stores (estimated total cost, negative cost, cell) tuples,
+        #so ties are broken in favour of the nodes closer to the goal
+        openList = [(0, 0, startCell)]
+        costs = {startCell: 0}
+        parents = {startCell: -1}
+        closedCells = set()
+
+        while len(openList) > 0:
+            currentCell = heapq.heappop(openList)[2]
+            if currentCell in closedCells:
+                continue
+
+            closedCells.add(currentCell)
+            self.numberOfExpandedNodes += 1
+            if currentCell == goalCell:
+                break
+
+            if useJumpPoints:
+                successors = self._findJumpPoints(currentCell, parents[currentCell], goalCell)
+            else:
+                successors = self.grid.neighbours(currentCell)
+
+            for successor in successors:
+                row, column = divmod(successor, stride)
+                currentRow, currentColumn = divmod(currentCell, stride)
+                cost = costs[currentCell] + abs(row - currentRow) + abs(column - currentColumn)
+
+                if successor not in costs or cost < costs[successor]:
+                    costs[successor] = cost
+                    parents[successor] = currentCell
+                    totalCost = cost + abs(row - goalRow) + abs(column - goalColumn)
+                    heapq.heappush(openList, (totalCost, -cost, successor))
+
+        if goalCell not in closedCells:
+            return []
+
+        #the cells between two consecutive jump points lie on a straight line
+        path = [self.grid.coordinates(goalCell)]
+        currentCell = goalCell
+        while parents[currentCell] != -1:
+            parent = parents[currentCell]
+            step = self._direction(parent, currentCell)
+            while currentCell != parent:
+                currentCell -= step
+                path.append(self.grid.coordinates(currentCell))
+        return path[::-1]
+
+    #<summary>Finds the direction of a straight move between two cells.</summary>
+    #<param name='fromCell'>The id of the cell where the move starts.</param>
+    #<param name='toCell'>The id of the cell where the move ends; has to be in the same row or column as 'fromCell'.</param>
+    #<returns>The difference between the ids of two consecutive cells along the move.</returns>
+    def _direction(self, fromCell, toCell):
+        stride = self.grid.stride
+        if fromCell / stride == toCell / stride:
+            step = 1
+        else:
+            step = stride
+
+        if toCell < fromCell:
+            step = -step
+        return step
+
+    #<summary>Checks whether a cell is inside the world and not blocked.</summary>
+    #<param name='cell'>The id of a cell.</param>
+    #<returns>'True' if the cell can be entered and 'False' otherwise.</returns>
+    def _isFree(self, cell):
+        return cell > -1 and cell < self.grid.size and not self.grid.isBlocked(cell)
+
+    #<summary>Finds the successors of a node in jump point search. Only the moves that
+    #might be part of an optimal path coming from the parent are followed; moving
+    #horizontally, we can also turn up or down, while moving vertically, we can also turn
+    #left or right. Each move is followed until the next jump point.
+    #</summary>
+    #<param name='cell'>The id of the node whose successors we want to find.</param>
+    #<param name='parent'>The id of the jump point from which the node was reached or -1 for the start node.</param>
+    #<param name='goalCell'>The id of the goal cell.</param>
+    #<returns>A list of cell ids of jump points.</returns>
+    def _findJumpPoints(self, cell, parent, goalCell):
+        stride = self.grid.stride
+        if parent == -1:
+            steps = [stride, -stride, 1, -1]
+        else:
+            step = self._direction(parent, cell)
+            if abs(step) == 1:
+                steps = [stride, -stride, step]
+            else:
+                steps = [1, -1, step]
+
+        jumpPoints = []
+        for step in steps:
+            jumpPoint = self._jump(cell + step, step, goalCell)
+            if jumpPoint != -1:
+                jumpPoints.append(jumpPoint)
+        return jumpPoints
+
+    #<summary>Moves in a straight line until reaching a jump point, which is either the goal,
+    #a cell next to an obstacle corner that opens a new way to the side (a forced neighbour),
+    #or, when moving vertically, a cell from which a horizontal move reaches a jump point.
+    #</summary>
+    #<param name='cell'>The id of the first cell of the move.</param>
+    #<param name='step'>The difference between the ids of two consecutive cells along the move.</param>
+    #<param name='goalCell'>The id of the goal cell.</param>
+    #<returns>The id of the jump point or -1 if the move runs into an obstacle.</returns>
+    def _jump(self, cell, step, goalCell):
+        stride = self.grid.stride
+        if abs(step) == 1:
+            sideSteps = [stride, -stride]
+        else:
+            sideSteps = [1, -1]
+
+        #'_isFree' is inlined in the loop, since this is where jump point search spends most of its time
+        cells = self.grid.cells
+        blocked = self.grid.blocked
+        size = self.grid.size
+        while cell > -1 and cell < size and not blocked[cells[cell]]:
+            if cell == goalCell:
+                return cell
+
+            for sideStep in sideSteps:
+                sideCell = cell + sideStep
+                previousSideCell = sideCell - step
+                if sideCell > -1 and sideCell < size and not blocked[cells[sideCell]]:
+                    if previousSideCell < 0 or previousSideCell >= size or blocked[cells[previousSideCell]]:
+                        return cell
+
+            if abs(step) != 1:
+                if self._jump(cell + 1, 1, goalCell) != -1 or self._jump(cell - 1, -1, goalCell) != -1:
+                    return cell
+
+            cell += step
+
+        return -1
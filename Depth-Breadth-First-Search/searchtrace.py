@@ -0,0 +1,26 @@
+from array import array
+
+#<summary>Records the progress of a grid search in compact arrays, so that
+#the search can be visualized after it has finished.
+#</summary>
+#<author>Aleksandar Mitrevski</author>
+class SearchTrace:
+    #<summary>Creates an empty trace.</summary>
+    def __init__(self):
+        #the ids of the expanded cells, in expansion order
+        self.expandedCells = array('l')
+
+        #the positions in 'expandedCells' at which goal cells were expanded
+        self.goalSteps = array('l')
+
+    #<summary>Records the expansion of a cell.</summary>
+    #<param name='cell'>The id of the expanded cell.</param>
+    #<param name='isGoal'>'True' if the cell is a goal cell.</param>
+    def expand(self, cell, isGoal):
+        if isGoal:
+            self.goalSteps.append(len(self.expandedCells))
+        self.expandedCells.append(cell)
+
+    #<returns>The number of recorded expansions.</returns>
+    def numberOfSteps(self):
+        return len(self.expandedCells)
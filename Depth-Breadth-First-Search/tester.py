@@ -1,3 +1,4 @@
+import mapfile
 import search
 
 #we define known constants about the world maps
@@ -15,11 +16,12 @@ while True:
         if fileIdentifier != '1' and fileIdentifier != '2' and fileIdentifier != '3':
             print 'Wrong input'
 
-    #if 'algorithmIdentifier' is '1', we run depth-first search and if it is '2', we run breadth-first search
+    #if 'algorithmIdentifier' is '1', we run depth-first search, if it is '2', we run breadth-first search,
+    #and if it is '3', we run a numpy flood fill (which is never visualized)
     algorithmIdentifier = '0'
-    while algorithmIdentifier != '1' and algorithmIdentifier != '2':
-        algorithmIdentifier = raw_input('Which search algorithm would you like to use?\nType 1 for Depth-first search\nType 2 for Breadth-first search\n')
-        if algorithmIdentifier != '1' and algorithmIdentifier != '2':
+    while algorithmIdentifier != '1' and algorithmIdentifier != '2' and algorithmIdentifier != '3':
+        algorithmIdentifier = raw_input('Which search algorithm would you like to use?\nType 1 for Depth-first search\nType 2 for Breadth-first search\nType 3 for NumPy flood fill\n')
+        if algorithmIdentifier != '1' and algorithmIdentifier != '2' and algorithmIdentifier != '3':
             print 'Wrong input'
 
     #if 'visualizeFlag' is '1', we visualize the search; if it is '2', we don't
@@ -29,19 +31,18 @@ while True:
         if visualizeFlag != '1' and visualizeFlag != '2':
             print 'Wrong input'
 
-    #we load the map and get rid of newline characters
-    worldFile = open('maps/map' + fileIdentifier + '.txt')
-    world = worldFile.readlines()
-    world = [line.strip() for line in world]
-    worldFile.close()
+    #we memory-map the map file instead of reading its lines into strings
+    world = mapfile.MappedWorld('maps/map' + fileIdentifier + '.txt')
 
     #we create a new instance of the search library with the new parameters
     searchLibrary = search.SearchLibrary(world, startMarker, obstacleMarkers, dirtMarker, visualizeFlag == '1')
 
     if algorithmIdentifier == '1':
         dirtPositions = searchLibrary.depthFirstSearch()
-    else:
+    elif algorithmIdentifier == '2':
         dirtPositions = searchLibrary.breadthFirstSearch()
+    else:
+        dirtPositions = searchLibrary.floodFillSearch()
 
     #we print the number of goals found after the search is over,
     #regardless of whether the search was visualized or not
@@ -1,7 +1,6 @@
 import graph
 import heap
 import aStarNode
-import coordinates
 import math
 
 class AStarLibrary(object):
@@ -10,14 +9,18 @@ class AStarLibrary(object):
     Author: Aleksandar Mitrevski
 
     """
-    def __init__(self, nodeGraph):
+    def __init__(self, nodeGraph, landmarkHeuristic=None):
         """Creates a new A* search library.
 
         Keyword arguments:
         graph -- A 'Graph' object.
+        landmarkHeuristic -- A 'landmarks.LandmarkHeuristic' object created for the graph or 'None'
+                             if only the straight-line distance should be used as a heuristic (default None).
 
         """
         self.nodeGraph = nodeGraph
+        self.landmarkHeuristic = landmarkHeuristic
+        self.numberOfExpandedNodes = 0
 
     def find_shortest_path(self, source, goal):
         """Finds a shortest path between 'source' and 'goal'.
@@ -27,32 +30,26 @@ class AStarLibrary(object):
         goal -- Either a label of a node in the graph or a 'Coordinates' object representing the coordinates of the goal position.
 
         """
-        stationsExist = True
-        if not isinstance(source, coordinates.Coordinates) and not self.nodeGraph.node_exists(source):
-            stationsExist = False
-
-        if not isinstance(goal, coordinates.Coordinates) and not self.nodeGraph.node_exists(goal):
-            stationsExist = False
-
-        if not stationsExist:
+        stations = self.nodeGraph.get_node_labels(source, goal)
+        if stations is None:
             return 'At least one of the specified stations does not exist'
+        source, goal = stations
 
-        if isinstance(source, coordinates.Coordinates):
-            source = self._find_closest_neighbour(source)
-
-        if isinstance(goal, coordinates.Coordinates):
-            goal = self._find_closest_neighbour(goal)
+        openList = heap.IndexedMinHeap()
 
-        openList = heap.MinHeap()
-        closedList = []
+        #the parents of the closed nodes are stored by label,
+        #so the path is reconstructed by following them from the goal
+        closedParents = dict()
 
         sourceNode = aStarNode.AStarNode(source, self.nodeGraph.nodes[source].coordinates, -1, 0, 0)
         openList.insert(sourceNode)
 
         pathFound = False
+        self.numberOfExpandedNodes = 0
         while not openList.empty() and not pathFound:
             currentNode = openList.extract_min()
-            closedList.append(currentNode)
+            closedParents[currentNode.nodeLabel] = currentNode.parent
+            self.numberOfExpandedNodes += 1
 
             if currentNode.nodeLabel == goal:
                 pathFound = True
@@ -60,40 +57,112 @@ class AStarLibrary(object):
 
             adjacent = self._get_adjacent_nodes(currentNode, goal)
             for _,node in enumerate(adjacent):
-                nodePosition = openList.get_index(node)
-                if nodePosition != -1:
-                    if openList.nodes[nodePosition].totalCost > node.totalCost:
-                        openList.nodes[nodePosition] = node
-                        openList.bubble_up(nodePosition)
-                else:
-                    nodeClosed = False
-                    for _,closedNode in enumerate(closedList):
-                        if node.nodeLabel == closedNode.nodeLabel:
-                            nodeClosed = True
-                            break
-
-                    if not nodeClosed:
-                        openList.insert(node)
+                if openList.contains(node.nodeLabel):
+                    openList.decrease_key(node)
+                elif node.nodeLabel not in closedParents:
+                    openList.insert(node)
 
         if currentNode.nodeLabel != goal:
             return 'A path between the stations was not found'
         else:
-            shortestPath = []
-            shortestPath.append(closedList[len(closedList)-1].nodeLabel)
-            parentNode = closedList[len(closedList)-1].parent
+            shortestPath = [goal]
+            parentNode = closedParents[goal]
+            while parentNode != -1:
+                shortestPath.append(parentNode)
+                parentNode = closedParents[parentNode]
 
-            if parentNode != -1:
-                while True:
-                    shortestPath.append(parentNode)
-                    for _,node in enumerate(closedList):
-                        if node.nodeLabel == parentNode:
-                            parentNode = node.parent
-                            break
+            return shortestPath[::-1]
 
-                    if parentNode == -1:
-                        break
+    def find_shortest_path_bidirectional(self, source, goal):
+        """Finds a shortest path between 'source' and 'goal' with bidirectional A*: one search
+        runs forward from 'source' and the other backward from 'goal' along the reverse edges.
+        The parameters and results are the same as those of 'find_shortest_path'.
 
-            return shortestPath[::-1]
+        Both searches use the average of the heuristic towards the goal and the heuristic
+        from the source as a potential (with opposite signs), which keeps the potentials
+        consistent for both searches, so a node is never expanded twice by the same search.
+        The search stops once the smallest total costs of both open lists add up to at least
+        the cost of the best path found so far; no path through an unexpanded node can be shorter.
+
+        Keyword arguments:
+        source -- Either a label of a node in the graph or a 'Coordinates' object representing the coordinates of the initial position.
+        goal -- Either a label of a node in the graph or a 'Coordinates' object representing the coordinates of the goal position.
+
+        """
+        stations = self.nodeGraph.get_node_labels(source, goal)
+        if stations is None:
+            return 'At least one of the specified stations does not exist'
+        source, goal = stations
+
+        if source == goal:
+            return [source]
+
+        #index 0 belongs to the forward search and index 1 to the backward search
+        openLists = [heap.IndexedMinHeap(), heap.IndexedMinHeap()]
+        closedNodes = [set(), set()]
+        costs = [{source: 0.}, {goal: 0.}]
+        parents = [{source: -1}, {goal: -1}]
+
+        openLists[0].insert(aStarNode.AStarNode(source, self.nodeGraph.nodes[source].coordinates, -1, 0., self._calculate_potential(source, source, goal)))
+        openLists[1].insert(aStarNode.AStarNode(goal, self.nodeGraph.nodes[goal].coordinates, -1, 0., -self._calculate_potential(goal, source, goal)))
+
+        shortestPathCost = float('inf')
+        meetingNode = -1
+        self.numberOfExpandedNodes = 0
+        while not openLists[0].empty() and not openLists[1].empty():
+            if openLists[0].nodes[0].totalCost + openLists[1].nodes[0].totalCost >= shortestPathCost:
+                break
+
+            #the search with the smaller open list is advanced, which balances the work of both searches
+            direction = 0
+            if len(openLists[1].nodes) < len(openLists[0].nodes):
+                direction = 1
+
+            currentNode = openLists[direction].extract_min()
+            closedNodes[direction].add(currentNode.nodeLabel)
+            self.numberOfExpandedNodes += 1
+
+            if direction == 0:
+                edges = self.nodeGraph.nodes[currentNode.nodeLabel].children
+            else:
+                edges = self.nodeGraph.nodes[currentNode.nodeLabel].parents
+
+            for _,edge in enumerate(edges):
+                nodeLabel = edge.connectedNode
+                if nodeLabel in closedNodes[direction]:
+                    continue
+
+                cost = currentNode.cost + edge.cost
+                if cost >= costs[direction].get(nodeLabel, float('inf')):
+                    continue
+                costs[direction][nodeLabel] = cost
+                parents[direction][nodeLabel] = currentNode.nodeLabel
+
+                #the other search has already reached the node, so there is a path through it
+                if nodeLabel in costs[1 - direction] and cost + costs[1 - direction][nodeLabel] < shortestPathCost:
+                    shortestPathCost = cost + costs[1 - direction][nodeLabel]
+                    meetingNode = nodeLabel
+
+                potential = self._calculate_potential(nodeLabel, source, goal)
+                if direction == 1:
+                    potential = -potential
+                node = aStarNode.AStarNode(nodeLabel, self.nodeGraph.nodes[nodeLabel].coordinates, currentNode.nodeLabel, cost, cost + potential)
+                if openLists[direction].contains(nodeLabel):
+                    openLists[direction].decrease_key(node)
+                else:
+                    openLists[direction].insert(node)
+
+        if meetingNode == -1:
+            return 'A path between the stations was not found'
+
+        shortestPath = [meetingNode]
+        while parents[0][shortestPath[-1]] != -1:
+            shortestPath.append(parents[0][shortestPath[-1]])
+        shortestPath.reverse()
+        while parents[1][shortestPath[-1]] != -1:
+            shortestPath.append(parents[1][shortestPath[-1]])
+
+        return shortestPath
 
     def _get_adjacent_nodes(self, currentNode, goal):
         """Returns a list of 'AStarNode' objects representing the nodes adjacent to 'currentNode'.
@@ -118,7 +187,8 @@ class AStarLibrary(object):
         return adjacentNodes
 
     def _calculate_heuristic(self, node, goal):
-        """Calculates a value for the heuristic between 'node' and 'goal'.
+        """Calculates a value for the heuristic between 'node' and 'goal': the straight-line distance
+        between them or, if a landmark heuristic is used, the larger of that distance and the landmark bound.
 
         Keyword arguments:
         node -- A node label (an integer) representing a node in the graph.
@@ -129,22 +199,19 @@ class AStarLibrary(object):
         goalCoordinates = self.nodeGraph.nodes[goal].coordinates
 
         distance = math.sqrt((nodeCoordinates.x - goalCoordinates.x)**2 + (nodeCoordinates.y - goalCoordinates.y)**2)
+        if self.landmarkHeuristic is not None:
+            distance = max(distance, self.landmarkHeuristic.lower_bound(node, goal))
         return distance
 
-    def _find_closest_neighbour(self, nodeCoordinates):
-        """Returns the key of a node (an integer) representing the graph node
-        whose coordinates are closest (using a straight-line distance) to 'nodeCoordinates'.
+    def _calculate_potential(self, node, source, goal):
+        """Calculates the potential of 'node' in the forward search of 'find_shortest_path_bidirectional':
+        half of the difference between the heuristic towards 'goal' and the heuristic from 'source'.
+        The backward search uses the negated potential.
 
         Keyword arguments:
-        nodeCoordinates -- A 'Coordinates' object representing the coordinates of a point.
+        node -- A node label (an integer) representing a node in the graph.
+        source -- A node label (an integer) representing the source node.
+        goal -- A node label (an integer) representing the goal node.
 
         """
-        minKey = -1
-        minDistance = 10000000000000000.0
-        for key, value in self.nodeGraph.nodes.items():
-            distance = math.sqrt((value.coordinates.x - nodeCoordinates.x)**2 + (value.coordinates.y - nodeCoordinates.y)**2)
-            if distance < minDistance:
-                minDistance = distance
-                minKey = key
-
-        return minKey
+        return (self._calculate_heuristic(node, goal) - self._calculate_heuristic(source, node)) / 2.
@@ -0,0 +1,122 @@
+import aStar
+import contraction
+import landmarks
+import os
+import random
+import stationgraph
+import tempfile
+import time
+
+numberOfQueries = 50
+cacheDirectory = os.path.join(tempfile.gettempdir(), 'station_graphs')
+
+#the graphs have the same number of edges per station as the tester's graph,
+#so the latencies show how the queries scale with the size of the graph
+print 'stations'.rjust(10) + 'edges'.rjust(10) + 'mean [ms]'.rjust(12) + 'median [ms]'.rjust(13) + '95% [ms]'.rjust(11) + 'max [ms]'.rjust(11)
+for numberOfStations in [3500, 10000, 30000, 100000]:
+    numberOfConnections = numberOfStations * 30 / 7
+    stationGraph = stationgraph.generate_station_graph(numberOfStations, numberOfConnections, seed=0, cacheDirectory=cacheDirectory)
+    aStarLibrary = aStar.AStarLibrary(stationGraph)
+
+    randomGenerator = random.Random(numberOfStations)
+    latencies = []
+    for i in xrange(numberOfQueries):
+        source = randomGenerator.randint(1, numberOfStations)
+        goal = randomGenerator.randint(1, numberOfStations)
+
+        startTime = time.time()
+        aStarLibrary.find_shortest_path(source, goal)
+        latencies.append((time.time() - startTime) * 1000.)
+
+    latencies.sort()
+    meanLatency = sum(latencies) / len(latencies)
+    print str(numberOfStations).rjust(10) + str(numberOfConnections).rjust(10) + ('%.2f' % meanLatency).rjust(12) + ('%.2f' % latencies[len(latencies) / 2]).rjust(13) + ('%.2f' % latencies[int(len(latencies) * 0.95)]).rjust(11) + ('%.2f' % latencies[-1]).rjust(11)
+
+#the landmark distances are stored next to the cached graphs, so
+#only the first run of the benchmark spends time on computing them
+print '\n' + 'stations'.rjust(10) + 'expanded (straight line)'.rjust(26) + 'expanded (landmarks)'.rjust(22) + 'mean [ms] (landmarks)'.rjust(23)
+for numberOfStations in [3500, 10000, 30000, 100000]:
+    numberOfConnections = numberOfStations * 30 / 7
+    stationGraph = stationgraph.generate_station_graph(numberOfStations, numberOfConnections, seed=0, cacheDirectory=cacheDirectory)
+    landmarkFile = os.path.join(cacheDirectory, 'landmarks_%d_%d_0.npz' % (numberOfStations, numberOfConnections))
+    landmarkHeuristic = landmarks.LandmarkHeuristic(stationGraph, 8, landmarkFile)
+    straightLineLibrary = aStar.AStarLibrary(stationGraph)
+    landmarkLibrary = aStar.AStarLibrary(stationGraph, landmarkHeuristic)
+
+    randomGenerator = random.Random(numberOfStations)
+    straightLineExpansions = 0
+    landmarkExpansions = 0
+    landmarkTime = 0.
+    for i in xrange(numberOfQueries):
+        source = randomGenerator.randint(1, numberOfStations)
+        goal = randomGenerator.randint(1, numberOfStations)
+
+        straightLineLibrary.find_shortest_path(source, goal)
+        straightLineExpansions += straightLineLibrary.numberOfExpandedNodes
+
+        startTime = time.time()
+        landmarkLibrary.find_shortest_path(source, goal)
+        landmarkTime += time.time() - startTime
+        landmarkExpansions += landmarkLibrary.numberOfExpandedNodes
+
+    print str(numberOfStations).rjust(10) + ('%.1f' % (float(straightLineExpansions) / numberOfQueries)).rjust(26) + ('%.1f' % (float(landmarkExpansions) / numberOfQueries)).rjust(22) + ('%.2f' % (landmarkTime * 1000. / numberOfQueries)).rjust(23)
+
+#the contraction is the slowest part, so the hierarchies are also stored next to the cached
+#graphs; the stations settled by a hierarchy query are compared with the nodes expanded by A*
+print '\n' + 'stations'.rjust(10) + 'expanded (A*)'.rjust(15) + 'settled (hierarchy)'.rjust(21) + 'mean [ms] (A*)'.rjust(16) + 'mean [ms] (hierarchy)'.rjust(23)
+for numberOfStations in [3500, 10000, 30000]:
+    numberOfConnections = numberOfStations * 30 / 7
+    stationGraph = stationgraph.generate_station_graph(numberOfStations, numberOfConnections, seed=0, cacheDirectory=cacheDirectory)
+    hierarchyFile = os.path.join(cacheDirectory, 'hierarchy_%d_%d_0.npz' % (numberOfStations, numberOfConnections))
+    hierarchy = contraction.ContractionHierarchy(stationGraph, hierarchyFile)
+    aStarLibrary = aStar.AStarLibrary(stationGraph)
+
+    randomGenerator = random.Random(numberOfStations)
+    aStarExpansions = 0
+    settledNodes = 0
+    aStarTime = 0.
+    hierarchyTime = 0.
+    for i in xrange(numberOfQueries):
+        source = randomGenerator.randint(1, numberOfStations)
+        goal = randomGenerator.randint(1, numberOfStations)
+
+        startTime = time.time()
+        aStarLibrary.find_shortest_path(source, goal)
+        aStarTime += time.time() - startTime
+        aStarExpansions += aStarLibrary.numberOfExpandedNodes
+
+        startTime = time.time()
+        hierarchy.find_shortest_path(source, goal)
+        hierarchyTime += time.time() - startTime
+        settledNodes += hierarchy.numberOfSettledNodes
+
+    print str(numberOfStations).rjust(10) + ('%.1f' % (float(aStarExpansions) / numberOfQueries)).rjust(15) + ('%.1f' % (float(settledNodes) / numberOfQueries)).rjust(21) + ('%.2f' % (aStarTime * 1000. / numberOfQueries)).rjust(16) + ('%.2f' % (hierarchyTime * 1000. / numberOfQueries)).rjust(23)
+
+#bidirectional A* with the straight-line distance only; long queries
+#are where it helps most, since both searches cover about half of the distance
+print '\n' + 'stations'.rjust(10) + 'expanded (one way)'.rjust(20) + 'expanded (bidirectional)'.rjust(26) + 'mean [ms] (one way)'.rjust(21) + 'mean [ms] (bidirectional)'.rjust(27)
+for numberOfStations in [3500, 10000, 30000, 100000]:
+    numberOfConnections = numberOfStations * 30 / 7
+    stationGraph = stationgraph.generate_station_graph(numberOfStations, numberOfConnections, seed=0, cacheDirectory=cacheDirectory)
+    aStarLibrary = aStar.AStarLibrary(stationGraph)
+
+    randomGenerator = random.Random(numberOfStations)
+    oneWayExpansions = 0
+    bidirectionalExpansions = 0
+    oneWayTime = 0.
+    bidirectionalTime = 0.
+    for i in xrange(numberOfQueries):
+        source = randomGenerator.randint(1, numberOfStations)
+        goal = randomGenerator.randint(1, numberOfStations)
+
+        startTime = time.time()
+        aStarLibrary.find_shortest_path(source, goal)
+        oneWayTime += time.time() - startTime
+        oneWayExpansions += aStarLibrary.numberOfExpandedNodes
+
+        startTime = time.time()
+        aStarLibrary.find_shortest_path_bidirectional(source, goal)
+        bidirectionalTime += time.time() - startTime
+        bidirectionalExpansions += aStarLibrary.numberOfExpandedNodes
+
+    print str(numberOfStations).rjust(10) + ('%.1f' % (float(oneWayExpansions) / numberOfQueries)).rjust(20) + ('%.1f' % (float(bidirectionalExpansions) / numberOfQueries)).rjust(26) + ('%.2f' % (oneWayTime * 1000. / numberOfQueries)).rjust(21) + ('%.2f' % (bidirectionalTime * 1000. / numberOfQueries)).rjust(27)
@@ -0,0 +1,387 @@
+import heapq
+import math
+import numpy
+import os
+
+class ContractionHierarchy(object):
+    """Defines a contraction hierarchy of a graph, which answers shortest path
+    queries by settling only a small part of the graph.
+
+    The nodes are contracted one by one, least important first: a contracted node
+    is removed from the graph, and each path u -> node -> w through it is replaced by
+    a shortcut edge u -> w unless a path between u and w that is at most as long
+    exists without the node (a witness). A query runs a search from the source and,
+    backwards, from the goal, both only along edges that lead to nodes contracted later;
+    the shortcuts on the best meeting path are then unpacked into the original edges.
+
+    Random station graphs have no real hierarchy, so the contraction stops once the
+    remaining nodes get too dense; these nodes form a core. The upward searches stop
+    at the core, and the core is then searched from the reached core nodes by bidirectional
+    A*, guided by the straight-line distance and, optionally, landmark bounds.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self, nodeGraph, fileName=None, witnessSearchLimit=50, witnessHopLimit=2, maximumCoreDegree=10., landmarkHeuristic=None):
+        """Contracts a graph or loads a hierarchy created for a graph with the same nodes and edges from a file.
+
+        Keyword arguments:
+        nodeGraph -- A 'graph.Graph' object.
+        fileName -- Name of a .npz file in which the hierarchy is stored or 'None' if it shouldn't be stored (default None).
+        witnessSearchLimit -- The maximum number of nodes settled by a witness search (default 50).
+        witnessHopLimit -- The maximum number of edges of a witness path (default 2).
+        maximumCoreDegree -- The contraction stops once the nodes that are not contracted yet have this many
+                             edges on average; 'None' contracts all nodes (default 10.).
+        landmarkHeuristic -- A 'landmarks.LandmarkHeuristic' object created for the graph, whose bounds
+                             strengthen the potentials of the core searches, or 'None' (default None).
+
+        """
+        self.nodeGraph = nodeGraph
+        self.landmarkHeuristic = landmarkHeuristic
+        self.numberOfSettledNodes = 0
+        self.coordinates = dict([(label, (node.coordinates.x, node.coordinates.y)) for label, node in nodeGraph.nodes.iteritems()])
+
+        #'upwardChildren' maps a node to the (child, cost) pairs of its edges to nodes
+        #contracted later, 'upwardParents' maps a node to the (parent, cost) pairs of
+        #the edges from nodes contracted later, and 'middleNodes' maps each shortcut
+        #(u, w) to the node whose contraction created it; the edges of the core nodes
+        #are the edges between them
+        self.upwardChildren = dict()
+        self.upwardParents = dict()
+        self.middleNodes = dict()
+        self.coreNodes = set()
+
+        loaded = False
+        if fileName is not None and os.path.exists(fileName):
+            loaded = self.load(fileName)
+
+        if not loaded:
+            self._contract(witnessSearchLimit, witnessHopLimit, maximumCoreDegree)
+            if fileName is not None:
+                self.save(fileName)
+
+    def find_shortest_path(self, source, goal):
+        """Finds a shortest path between 'source' and 'goal'; the parameters and results
+        are the same as those of 'aStar.AStarLibrary.find_shortest_path'.
+
+        Keyword arguments:
+        source -- Either a label of a node in the graph or a 'Coordinates' object representing the coordinates of the initial position.
+        goal -- Either a label of a node in the graph or a 'Coordinates' object representing the coordinates of the goal position.
+
+        """
+        stations = self.nodeGraph.get_node_labels(source, goal)
+        if stations is None:
+            return 'At least one of the specified stations does not exist'
+        source, goal = stations
+
+        #index 0 belongs to the search from the source and index 1 to the search from the goal;
+        #'meeting' stores the length of the shortest path found so far and the node where it is split
+        distances = [{source: 0.}, {goal: 0.}]
+        parents = [{source: -1}, {goal: -1}]
+        edges = [self.upwardChildren, self.upwardParents]
+        meeting = (float('inf'), -1)
+        if source == goal:
+            meeting = (0., source)
+        self.numberOfSettledNodes = 0
+
+        #the searches first settle the contracted nodes they reach along edges to nodes
+        #contracted later; they don't leave the core nodes, whose distances are only recorded
+        for direction in (0, 1):
+            queue = [(0., [source, goal][direction])]
+            settled = set()
+            while len(queue) > 0:
+                distance, node = heapq.heappop(queue)
+                if distance >= meeting[0]:
+                    break
+                if node in settled or node in self.coreNodes:
+                    continue
+                settled.add(node)
+                self.numberOfSettledNodes += 1
+
+                for neighbour, cost in edges[direction].get(node, []):
+                    if distance + cost < distances[direction].get(neighbour, float('inf')):
+                        meeting = self._label(neighbour, node, distance + cost, direction, distances, parents, meeting)
+                        heapq.heappush(queue, (distance + cost, neighbour))
+
+        #the core is then searched from the reached core nodes like in 'aStar.AStarLibrary.find_shortest_path_bidirectional':
+        #the potentials are consistent because no edge or shortcut is shorter than the path it replaces,
+        #and the searches stop once the smallest keys of both queues add up to at least the best meeting distance
+        queues = [[], []]
+        for direction in (0, 1):
+            for node, distance in distances[direction].iteritems():
+                if node in self.coreNodes:
+                    queues[direction].append((distance + self._potential(node, source, goal, direction), node))
+            heapq.heapify(queues[direction])
+
+        settled = [set(), set()]
+        while True:
+            for direction in (0, 1):
+                while len(queues[direction]) > 0 and queues[direction][0][1] in settled[direction]:
+                    heapq.heappop(queues[direction])
+            if len(queues[0]) == 0 or len(queues[1]) == 0 or queues[0][0][0] + queues[1][0][0] >= meeting[0]:
+                break
+
+            #the search with the smaller queue is advanced, which balances the work of both searches
+            direction = 0
+            if len(queues[1]) < len(queues[0]):
+                direction = 1
+
+            _, node = heapq.heappop(queues[direction])
+            settled[direction].add(node)
+            self.numberOfSettledNodes += 1
+
+            distance = distances[direction][node]
+            for neighbour, cost in edges[direction][node]:
+                if neighbour not in settled[direction] and distance + cost < distances[direction].get(neighbour, float('inf')):
+                    meeting = self._label(neighbour, node, distance + cost, direction, distances, parents, meeting)
+                    heapq.heappush(queues[direction], (distance + cost + self._potential(neighbour, source, goal, direction), neighbour))
+
+        meetingNode = meeting[1]
+        if meetingNode == -1:
+            return 'A path between the stations was not found'
+
+        upwardPath = [meetingNode]
+        while parents[0][upwardPath[-1]] != -1:
+            upwardPath.append(parents[0][upwardPath[-1]])
+        upwardPath.reverse()
+        while parents[1][upwardPath[-1]] != -1:
+            upwardPath.append(parents[1][upwardPath[-1]])
+
+        shortestPath = [upwardPath[0]]
+        for i in xrange(len(upwardPath) - 1):
+            shortestPath.extend(self._unpack_edge(upwardPath[i], upwardPath[i+1]))
+        return shortestPath
+
+    def _label(self, node, parent, distance, direction, distances, parents, meeting):
+        """Stores a new distance of 'node' in the search 'direction' and returns the updated 'meeting' pair,
+        which changes if the other search has reached the node and the path through it is shorter.
+
+        """
+        distances[direction][node] = distance
+        parents[direction][node] = parent
+        otherDistances = distances[1 - direction]
+        if node in otherDistances and distance + otherDistances[node] < meeting[0]:
+            return (distance + otherDistances[node], node)
+        return meeting
+
+    def _potential(self, node, source, goal, direction):
+        """Returns the potential of 'node' in the core search 'direction': half of the difference between
+        the lower bounds of the distance to 'goal' and of the distance from 'source', negated if 'direction' is 1.
+
+        """
+        potential = (self._lower_bound(node, goal) - self._lower_bound(source, node)) / 2.
+        if direction == 1:
+            potential = -potential
+        return potential
+
+    def _lower_bound(self, node1, node2):
+        """Returns a lower bound of the distance from 'node1' to 'node2': the straight-line distance
+        or, if a landmark heuristic is used, the larger of that distance and the landmark bound.
+
+        """
+        x1, y1 = self.coordinates[node1]
+        x2, y2 = self.coordinates[node2]
+        distance = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+        if self.landmarkHeuristic is not None:
+            distance = max(distance, self.landmarkHeuristic.lower_bound(node1, node2))
+        return distance
+
+    def save(self, fileName):
+        """Saves the hierarchy to a .npz file.
+
+        Keyword arguments:
+        fileName -- Name of the file.
+
+        """
+        edgeArrays = []
+        for edges in (self.upwardChildren, self.upwardParents):
+            nodes = []
+            neighbours = []
+            costs = []
+            for node, nodeEdges in edges.iteritems():
+                for neighbour, cost in nodeEdges:
+                    nodes.append(node)
+                    neighbours.append(neighbour)
+                    costs.append(cost)
+            edgeArrays.append((numpy.array(nodes, dtype=numpy.int64), numpy.array(neighbours, dtype=numpy.int64), numpy.array(costs, dtype=numpy.float64)))
+
+        shortcuts = numpy.array([(u, w, v) for (u, w), v in self.middleNodes.iteritems()], dtype=numpy.int64).reshape(-1, 3)
+        numberOfEdges, edgeHash = self.nodeGraph.edge_fingerprint()
+        numpy.savez(fileName, labels=numpy.array(sorted(self.nodeGraph.nodes.keys()), dtype=numpy.int64),
+                    numberOfEdges=numberOfEdges, edgeHash=edgeHash,
+                    childNodes=edgeArrays[0][0], children=edgeArrays[0][1], childCosts=edgeArrays[0][2],
+                    parentNodes=edgeArrays[1][0], parents=edgeArrays[1][1], parentCosts=edgeArrays[1][2],
+                    shortcuts=shortcuts, coreNodes=numpy.array(sorted(self.coreNodes), dtype=numpy.int64))
+
+    def load(self, fileName):
+        """Loads a hierarchy saved by 'save'. Returns 'True' if the hierarchy is loaded and 'False'
+        if it was created for a graph with different nodes or edges (see 'graph.Graph.edge_fingerprint').
+
+        Keyword arguments:
+        fileName -- Name of the file.
+
+        """
+        labels = numpy.array(sorted(self.nodeGraph.nodes.keys()), dtype=numpy.int64)
+        numberOfEdges, edgeHash = self.nodeGraph.edge_fingerprint()
+
+        arrays = numpy.load(fileName)
+        sameGraph = ('edgeHash' in arrays.files and 'coreNodes' in arrays.files and numpy.array_equal(arrays['labels'], labels)
+                     and int(arrays['numberOfEdges']) == numberOfEdges and str(arrays['edgeHash']) == edgeHash)
+        if not sameGraph:
+            arrays.close()
+            return False
+
+        self.upwardChildren = dict()
+        for node, child, cost in zip(arrays['childNodes'].tolist(), arrays['children'].tolist(), arrays['childCosts'].tolist()):
+            self.upwardChildren.setdefault(node, []).append((child, cost))
+
+        self.upwardParents = dict()
+        for node, parent, cost in zip(arrays['parentNodes'].tolist(), arrays['parents'].tolist(), arrays['parentCosts'].tolist()):
+            self.upwardParents.setdefault(node, []).append((parent, cost))
+
+        self.middleNodes = dict()
+        for u, w, v in arrays['shortcuts'].tolist():
+            self.middleNodes[(u, w)] = v
+
+        self.coreNodes = set(arrays['coreNodes'].tolist())
+        arrays.close()
+        return True
+
+    def _contract(self, witnessSearchLimit, witnessHopLimit, maximumCoreDegree):
+        """Contracts the nodes of the graph and fills the upward edges and the shortcuts.
+
+        Keyword arguments:
+        witnessSearchLimit -- The maximum number of nodes settled by a witness search.
+        witnessHopLimit -- The maximum number of edges of a witness path.
+        maximumCoreDegree -- The average number of edges of the uncontracted nodes at which the contraction stops or 'None'.
+
+        """
+        #the edges between the nodes that are not contracted yet;
+        #parallel edges are replaced by the cheapest one
+        children = dict([(label, dict()) for label in self.nodeGraph.nodes])
+        parents = dict([(label, dict()) for label in self.nodeGraph.nodes])
+        for label, node in self.nodeGraph.nodes.iteritems():
+            for edge in node.children:
+                child = edge.connectedNode
+                if child != label and edge.cost < children[label].get(child, float('inf')):
+                    children[label][child] = edge.cost
+                    parents[child][label] = edge.cost
+
+        numberOfEdges = sum([len(nodeChildren) for nodeChildren in children.itervalues()])
+        contractedNeighbours = dict([(label, 0) for label in self.nodeGraph.nodes])
+        queue = []
+        for label in self.nodeGraph.nodes:
+            shortcuts = self._shortcuts(label, children, parents, witnessSearchLimit, witnessHopLimit)
+            heapq.heappush(queue, (self._priority(label, shortcuts, children, parents, contractedNeighbours), label))
+
+        while len(queue) > 0:
+            #graphs without a hierarchy, such as graphs with random edges between distant nodes, get
+            #denser and denser as nodes are contracted; the remaining nodes are then left as a core
+            if maximumCoreDegree is not None and numberOfEdges > maximumCoreDegree * len(children):
+                break
+
+            _, label = heapq.heappop(queue)
+
+            #the priorities change as neighbours are contracted, so
+            #a node is only contracted if its updated priority is still the lowest
+            shortcuts = self._shortcuts(label, children, parents, witnessSearchLimit, witnessHopLimit)
+            priority = self._priority(label, shortcuts, children, parents, contractedNeighbours)
+            if len(queue) > 0 and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, label))
+                continue
+
+            for u, w, cost in shortcuts:
+                if w not in children[u]:
+                    numberOfEdges += 1
+                children[u][w] = cost
+                parents[w][u] = cost
+                self.middleNodes[(u, w)] = label
+
+            self.upwardChildren[label] = children[label].items()
+            self.upwardParents[label] = parents[label].items()
+            numberOfEdges -= len(children[label]) + len(parents[label])
+            for child in children[label]:
+                del parents[child][label]
+                contractedNeighbours[child] += 1
+            for parent in parents[label]:
+                del children[parent][label]
+                contractedNeighbours[parent] += 1
+            del children[label]
+            del parents[label]
+
+        #the edges between the core nodes are used in both core searches
+        self.coreNodes = set(children.keys())
+        for label in children:
+            self.upwardChildren[label] = children[label].items()
+            self.upwardParents[label] = parents[label].items()
+
+    def _priority(self, label, shortcuts, children, parents, contractedNeighbours):
+        """Returns the contraction priority of a node: the number of shortcuts its contraction
+        would add minus the number of its edges, plus the number of its contracted neighbours.
+
+        """
+        return len(shortcuts) - len(children[label]) - len(parents[label]) + contractedNeighbours[label]
+
+    def _shortcuts(self, label, children, parents, witnessSearchLimit, witnessHopLimit):
+        """Returns a list of (u, w, cost) tuples with the shortcuts needed when the node with label 'label'
+        is contracted, i.e. the paths u -> label -> w without a witness path.
+
+        """
+        shortcuts = []
+        if len(children[label]) == 0:
+            return shortcuts
+
+        maximumChildCost = max(children[label].values())
+        for u, parentCost in parents[label].iteritems():
+            targets = set(children[label].keys())
+            targets.discard(u)
+            witnessDistances = self._witness_search(u, label, targets, parentCost + maximumChildCost, children, witnessSearchLimit, witnessHopLimit)
+            for w in targets:
+                if witnessDistances.get(w, float('inf')) > parentCost + children[label][w]:
+                    shortcuts.append((u, w, parentCost + children[label][w]))
+        return shortcuts
+
+    def _witness_search(self, source, excludedNode, targets, maximumCost, children, witnessSearchLimit, witnessHopLimit):
+        """Runs a limited Dijkstra search from 'source' that doesn't pass through 'excludedNode',
+        doesn't follow paths with more than 'witnessHopLimit' edges and stops once all nodes in 'targets'
+        are settled. Returns a dictionary with the best known distances; they are upper bounds
+        of the shortest path distances, which is enough since missing witnesses only add shortcuts.
+
+        """
+        distances = {source: 0.}
+        hops = {source: 0}
+        queue = [(0., source)]
+        numberOfSettledNodes = 0
+        numberOfUnsettledTargets = len(targets)
+        while len(queue) > 0 and numberOfSettledNodes < witnessSearchLimit and numberOfUnsettledTargets > 0:
+            distance, node = heapq.heappop(queue)
+            if distance > distances[node]:
+                continue
+            if distance > maximumCost:
+                break
+            numberOfSettledNodes += 1
+            if node in targets:
+                numberOfUnsettledTargets -= 1
+            if hops[node] == witnessHopLimit:
+                continue
+
+            for child, cost in children[node].iteritems():
+                if child != excludedNode and distance + cost < distances.get(child, float('inf')):
+                    distances[child] = distance + cost
+                    hops[child] = hops[node] + 1
+                    heapq.heappush(queue, (distance + cost, child))
+        return distances
+
+    def _unpack_edge(self, u, w):
+        """Returns the original path of the edge u -> w without 'u'."""
+        path = []
+        stack = [(u, w)]
+        while len(stack) > 0:
+            edge = stack.pop()
+            if edge in self.middleNodes:
+                middleNode = self.middleNodes[edge]
+                stack.append((middleNode, edge[1]))
+                stack.append((edge[0], middleNode))
+            else:
+                path.append(edge[1])
+        return path
@@ -1,6 +1,9 @@
 import coordinates
+import hashlib
 import math
 import matplotlib.pyplot as pyplot
+import numpy
+import spatialindex
 
 class GraphNode(object):
     """Defines graph nodes.
@@ -20,6 +23,13 @@ class GraphNode(object):
         self.coordinates = coordinates
         self.children = []
 
+        #edges in the reverse direction, whose 'connectedNode' is the parent node;
+        #they are kept by 'Graph.add_edge', so the graph can also be searched backwards
+        self.parents = []
+
+        #the labels of the children make the duplicate edge check constant time
+        self.childLabels = set()
+
 
 class GraphEdge(object):
     """Defines a graph edge.
@@ -49,6 +59,10 @@ class Graph(object):
         """Creates a graph."""
         self.nodes = dict()
 
+        #the index is updated with each new node, so
+        #the nodes closest to given coordinates are found quickly
+        self.spatialIndex = spatialindex.SpatialIndex()
+
     def add_node(self, node):
         """Adds a node to the graph.
 
@@ -56,6 +70,7 @@ class Graph(object):
         node -- A 'GraphNode' object.
         """
         self.nodes[node.label] = node
+        self.spatialIndex.add(node.label, node.coordinates)
 
     def add_edge(self, parentNodeKey, childNodeKey):
         """Adds a directed edge between the nodes with labels
@@ -68,10 +83,13 @@ class Graph(object):
         childNodeKey -- Label of the child node.
 
         """
-        if childNodeKey not in self.nodes[parentNodeKey].children:
+        parentNode = self.nodes[parentNodeKey]
+        if childNodeKey not in parentNode.childLabels:
             cost = self._distance(parentNodeKey, childNodeKey)
             parentToChildEdge = GraphEdge(childNodeKey, cost)
-            self.nodes[parentNodeKey].children.append(parentToChildEdge)
+            parentNode.children.append(parentToChildEdge)
+            parentNode.childLabels.add(childNodeKey)
+            self.nodes[childNodeKey].parents.append(GraphEdge(parentNodeKey, cost))
             return True
         else:
             return False
@@ -87,6 +105,55 @@ class Graph(object):
         else:
             return False
 
+    def get_node_labels(self, source, goal):
+        """Returns a tuple with the labels of the source and goal nodes of a path query, where coordinates are
+        replaced by the labels of the closest nodes, or 'None' if a specified label does not exist in the graph.
+
+        Keyword arguments:
+        source -- Either a label of a node in the graph or a 'Coordinates' object.
+        goal -- Either a label of a node in the graph or a 'Coordinates' object.
+
+        """
+        if not isinstance(source, coordinates.Coordinates) and not self.node_exists(source):
+            return None
+
+        if not isinstance(goal, coordinates.Coordinates) and not self.node_exists(goal):
+            return None
+
+        if isinstance(source, coordinates.Coordinates):
+            source = self.spatialIndex.nearest(source)
+
+        if isinstance(goal, coordinates.Coordinates):
+            goal = self.spatialIndex.nearest(goal)
+
+        return source, goal
+
+    def edge_fingerprint(self):
+        """Returns a (number of edges, hash) tuple that identifies the edges of the graph;
+        the hash is computed from the sorted (parent, child, cost) triples, so it doesn't depend
+        on the order in which the edges are added. Data computed for a graph and stored in a file
+        (e.g. landmark distances) should only be loaded for a graph with the same fingerprint.
+
+        """
+        parents = []
+        children = []
+        costs = []
+        for label, node in self.nodes.iteritems():
+            for edge in node.children:
+                parents.append(label)
+                children.append(edge.connectedNode)
+                costs.append(edge.cost)
+
+        parents = numpy.array(parents, dtype=numpy.int64)
+        children = numpy.array(children, dtype=numpy.int64)
+        costs = numpy.array(costs, dtype=numpy.float64)
+        order = numpy.lexsort((costs, children, parents))
+
+        edgeHash = hashlib.sha1()
+        for values in (parents, children, costs):
+            edgeHash.update(numpy.ascontiguousarray(values[order]).tobytes())
+        return len(order), edgeHash.hexdigest()
+
     def visualize_graph(self, shortestPathNodes):
         """Visualizes the graph after finding a shortest path between two nodes.
 
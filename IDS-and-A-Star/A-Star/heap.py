@@ -126,3 +126,89 @@ class MinHeap(object):
     def empty(self):
         """Returns 'True' if the heap is empty and 'False' otherwise."""
         return len(self.nodes) == 0
+
+
+class IndexedMinHeap(MinHeap):
+    """Defines a min heap that knows the position of each node label in the heap,
+    so checking whether a node is in the heap takes constant time and
+    lowering the cost of a node takes logarithmic time.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self):
+        """Initializes an empty heap. Uses nodes of type 'AStarNode'."""
+        super(IndexedMinHeap, self).__init__()
+        self.positions = dict()
+
+    def insert(self, node):
+        """Inserts a node into the heap; the heap may not contain
+        another node with the same label.
+
+        Keyword arguments:
+        node -- An 'AStarNode' object.
+
+        """
+        self.positions[node.nodeLabel] = len(self.nodes)
+        super(IndexedMinHeap, self).insert(node)
+
+    def extract_min(self):
+        """Returns the minimum cost node from the heap."""
+        minimumNode = self.nodes[0]
+        lastNode = self.nodes.pop()
+        del self.positions[minimumNode.nodeLabel]
+
+        if len(self.nodes) > 0:
+            self.nodes[0] = lastNode
+            self.positions[lastNode.nodeLabel] = 0
+            self._bubble_down(0)
+        return minimumNode
+
+    def decrease_key(self, node):
+        """Replaces the heap node that has the same label as 'node' by 'node'
+        if 'node' has a lower total cost. Returns 'True' if the node is replaced
+        and 'False' otherwise.
+
+        Keyword arguments:
+        node -- An 'AStarNode' object whose label is in the heap.
+
+        """
+        index = self.positions[node.nodeLabel]
+        if self.nodes[index].totalCost <= node.totalCost:
+            return False
+
+        self.nodes[index] = node
+        self.bubble_up(index)
+        return True
+
+    def contains(self, nodeLabel):
+        """Returns 'True' if the heap contains a node with label 'nodeLabel' and 'False' otherwise.
+
+        Keyword arguments:
+        nodeLabel -- A node label (an integer).
+
+        """
+        return nodeLabel in self.positions
+
+    def get_index(self, node):
+        """Returns the index of 'node' in the heap or -1 if 'node' does not exist in the heap.
+
+        Keyword arguments:
+        node -- An 'AStarNode' object representing the node whose index we want to find.
+
+        """
+        return self.positions.get(node.nodeLabel, -1)
+
+    def _swap(self, index1, index2):
+        """Swaps the heap nodes whose indices are 'index1' and 'index2'
+        and updates their positions.
+
+        Keyword arguments:
+        index1 -- Index of a node in the heap.
+        index2 -- Index of another node in the heap.
+
+        """
+        super(IndexedMinHeap, self)._swap(index1, index2)
+        self.positions[self.nodes[index1].nodeLabel] = index1
+        self.positions[self.nodes[index2].nodeLabel] = index2
+        return self
@@ -0,0 +1,135 @@
+import heapq
+import math
+import numpy
+import os
+
+class LandmarkHeuristic(object):
+    """Defines the ALT heuristic (A*, landmarks, and the triangle inequality).
+    The shortest path distances from and to a few landmark nodes are computed once;
+    for any node n, goal t and landmark L, the triangle inequality gives the lower
+    bounds d(L,t) - d(L,n) and d(n,L) - d(t,L) of the distance from n to t.
+
+    The landmarks are the nodes farthest from the centre of the graph in equally large
+    angular sectors around it, so they lie around the border of the station map.
+    Nodes that cannot reach a landmark (or be reached from it) are treated as if they
+    were at a distance 'unreachableDistance' from it, which keeps the bounds valid.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    unreachableDistance = 1e15
+
+    def __init__(self, nodeGraph, numberOfLandmarks=8, fileName=None):
+        """Computes the landmark distances of a graph or loads them from a file
+        created for a graph with the same nodes and edges.
+
+        Keyword arguments:
+        nodeGraph -- A 'graph.Graph' object.
+        numberOfLandmarks -- The maximum number of landmarks (default 8).
+        fileName -- Name of a .npz file in which the distances are stored or 'None' if they shouldn't be stored (default None).
+
+        """
+        self.nodeGraph = nodeGraph
+        labels = numpy.array(sorted(nodeGraph.nodes.keys()), dtype=numpy.int64)
+        numberOfEdges, edgeHash = nodeGraph.edge_fingerprint()
+
+        #graphs with the same stations can have different edges, so the
+        #stored distances are only used if the edges are the same as well
+        arrays = None
+        if fileName is not None and os.path.exists(fileName):
+            arrays = numpy.load(fileName)
+            sameGraph = ('edgeHash' in arrays.files and numpy.array_equal(arrays['labels'], labels)
+                         and int(arrays['numberOfEdges']) == numberOfEdges and str(arrays['edgeHash']) == edgeHash)
+            if not sameGraph or len(arrays['landmarks']) > numberOfLandmarks:
+                arrays.close()
+                arrays = None
+
+        if arrays is not None:
+            self.landmarks = arrays['landmarks'].tolist()
+            fromLandmarks = arrays['fromLandmarks']
+            toLandmarks = arrays['toLandmarks']
+            arrays.close()
+        else:
+            self.landmarks = self._select_landmarks(numberOfLandmarks)
+            fromLandmarks = numpy.array([self._dijkstra(landmark, False) for landmark in self.landmarks]).reshape(-1, len(labels))
+            toLandmarks = numpy.array([self._dijkstra(landmark, True) for landmark in self.landmarks]).reshape(-1, len(labels))
+            if fileName is not None:
+                numpy.savez(fileName, labels=labels, numberOfEdges=numberOfEdges, edgeHash=edgeHash,
+                            landmarks=numpy.array(self.landmarks, dtype=numpy.int64),
+                            fromLandmarks=fromLandmarks, toLandmarks=toLandmarks)
+
+        #the distances of each node are kept in a tuple, which is
+        #faster to read from Python than a column of a numpy array
+        self.fromLandmarks = dict(zip(labels.tolist(), map(tuple, fromLandmarks.T.tolist())))
+        self.toLandmarks = dict(zip(labels.tolist(), map(tuple, toLandmarks.T.tolist())))
+
+    def lower_bound(self, node, goal):
+        """Returns a lower bound of the shortest path distance between 'node' and 'goal'.
+
+        Keyword arguments:
+        node -- A node label (an integer) representing a node in the graph.
+        goal -- A node label (an integer) representing the goal node.
+
+        """
+        bound = 0.
+        for landmarkToGoal, landmarkToNode in zip(self.fromLandmarks[goal], self.fromLandmarks[node]):
+            if landmarkToGoal - landmarkToNode > bound:
+                bound = landmarkToGoal - landmarkToNode
+        for nodeToLandmark, goalToLandmark in zip(self.toLandmarks[node], self.toLandmarks[goal]):
+            if nodeToLandmark - goalToLandmark > bound:
+                bound = nodeToLandmark - goalToLandmark
+        return bound
+
+    def _select_landmarks(self, numberOfLandmarks):
+        """Returns a list with the labels of the landmarks: the nodes farthest from the centre
+        of the graph in 'numberOfLandmarks' equally large angular sectors around it.
+
+        Keyword arguments:
+        numberOfLandmarks -- The number of sectors.
+
+        """
+        nodes = self.nodeGraph.nodes.values()
+        if len(nodes) == 0:
+            return []
+
+        centreX = sum([node.coordinates.x for node in nodes]) / len(nodes)
+        centreY = sum([node.coordinates.y for node in nodes]) / len(nodes)
+
+        farthestNodes = dict()
+        for node in nodes:
+            x = node.coordinates.x - centreX
+            y = node.coordinates.y - centreY
+            sector = int((math.atan2(y, x) + math.pi) / (2. * math.pi) * numberOfLandmarks) % numberOfLandmarks
+            distance = x**2 + y**2
+            if sector not in farthestNodes or distance > farthestNodes[sector][0]:
+                farthestNodes[sector] = (distance, node.label)
+
+        return [farthestNodes[sector][1] for sector in sorted(farthestNodes.keys())]
+
+    def _dijkstra(self, source, reverse):
+        """Returns a list with the shortest path distances between 'source' and all nodes,
+        in the order of the sorted node labels.
+
+        Keyword arguments:
+        source -- A node label (an integer).
+        reverse -- 'False' for the distances from 'source' and 'True' for the distances to 'source'.
+
+        """
+        distances = dict()
+        queue = [(0., source)]
+        while len(queue) > 0:
+            distance, label = heapq.heappop(queue)
+            if label in distances:
+                continue
+            distances[label] = distance
+
+            if reverse:
+                edges = self.nodeGraph.nodes[label].parents
+            else:
+                edges = self.nodeGraph.nodes[label].children
+
+            for edge in edges:
+                if edge.connectedNode not in distances:
+                    heapq.heappush(queue, (distance + edge.cost, edge.connectedNode))
+
+        return [distances.get(label, self.unreachableDistance) for label in sorted(self.nodeGraph.nodes.keys())]
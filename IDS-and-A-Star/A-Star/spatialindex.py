@@ -0,0 +1,304 @@
+import math
+import numpy
+
+class SpatialIndex(object):
+    """Defines a uniform grid of buckets that stores labelled points and finds
+    the points closest to given coordinates. A query only looks at the buckets
+    in growing square rings around the bucket of the queried coordinates and stops
+    once no point in the remaining rings can be closer than the points already found.
+
+    The bucket size is chosen so that the buckets contain a few points on average;
+    it is recomputed whenever the number of points has grown four times.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self):
+        """Creates an empty index."""
+        self.points = dict()
+        self.buckets = dict()
+        self.cellSize = 1.
+        self.numberOfPointsAtRebuild = 0
+
+        #the smallest and largest bucket coordinates in use
+        self.minCell = [0, 0]
+        self.maxCell = [-1, -1]
+
+        #numpy arrays used by 'nearest_batch'; they are created
+        #when needed and discarded when the points change
+        self.arrays = None
+
+    def add(self, label, coordinates):
+        """Adds a point to the index; a point with the same label is replaced.
+
+        Keyword arguments:
+        label -- A label of the point (an integer).
+        coordinates -- A 'Coordinates' object.
+
+        """
+        if label in self.points:
+            self.remove(label)
+
+        self.points[label] = (coordinates.x, coordinates.y)
+        self._add_to_bucket(label)
+        self.arrays = None
+
+        #the buckets are also recomputed if the points have spread
+        #so much that most of the buckets between them are empty
+        width = self.maxCell[0] - self.minCell[0] + 1
+        height = self.maxCell[1] - self.minCell[1] + 1
+        if len(self.points) > 4 * self.numberOfPointsAtRebuild or width * height > 8 * len(self.points) + 16:
+            self._rebuild()
+
+    def remove(self, label):
+        """Removes the point with label 'label' from the index.
+
+        Keyword arguments:
+        label -- A label of a point in the index (an integer).
+
+        """
+        cell = self._cell(*self.points[label])
+        self.buckets[cell].remove(label)
+        if len(self.buckets[cell]) == 0:
+            del self.buckets[cell]
+        del self.points[label]
+        self.arrays = None
+
+    def nearest(self, coordinates):
+        """Returns the label of the point closest to 'coordinates' or -1 if the index is empty.
+
+        Keyword arguments:
+        coordinates -- A 'Coordinates' object.
+
+        """
+        closestPoints = self.k_nearest(coordinates, 1)
+        if len(closestPoints) == 0:
+            return -1
+        return closestPoints[0]
+
+    def k_nearest(self, coordinates, k):
+        """Returns a list with the labels of the 'k' points closest to 'coordinates',
+        sorted by increasing distance; the list is shorter if the index has fewer points.
+
+        Keyword arguments:
+        coordinates -- A 'Coordinates' object.
+        k -- Number of points.
+
+        """
+        if len(self.points) == 0:
+            return []
+
+        x = coordinates.x
+        y = coordinates.y
+        cellX, cellY = self._cell(x, y)
+
+        #the rings closer than 'ring' don't contain any buckets in use
+        #and the rings farther than 'maximumRing' don't either
+        ring = max(0, self.minCell[0] - cellX, cellX - self.maxCell[0], self.minCell[1] - cellY, cellY - self.maxCell[1])
+        maximumRing = max(abs(cellX - self.minCell[0]), abs(cellX - self.maxCell[0]),
+                          abs(cellY - self.minCell[1]), abs(cellY - self.maxCell[1]))
+
+        candidates = []
+        while ring <= maximumRing:
+            for cell in self._ring_cells(cellX, cellY, ring):
+                for label in self.buckets.get(cell, []):
+                    pointX, pointY = self.points[label]
+                    candidates.append(((pointX - x)**2 + (pointY - y)**2, label))
+
+            #the points in the next rings are at least 'ring' buckets away
+            if len(candidates) >= k:
+                candidates.sort()
+                del candidates[k:]
+                if candidates[-1][0] <= (ring * self.cellSize)**2:
+                    break
+            ring += 1
+
+        candidates.sort()
+        return [label for _,label in candidates[:k]]
+
+    def nearest_batch(self, xCoordinates, yCoordinates):
+        """Returns a numpy array with the labels of the points closest to many coordinates;
+        all coordinates are handled together with numpy operations, one ring at a time.
+
+        Keyword arguments:
+        xCoordinates -- A sequence of x coordinates.
+        yCoordinates -- A sequence of y coordinates of the same length.
+
+        """
+        queryX = numpy.asarray(xCoordinates, dtype=numpy.float64)
+        queryY = numpy.asarray(yCoordinates, dtype=numpy.float64)
+        closestLabels = numpy.full(len(queryX), -1, dtype=numpy.int64)
+        if len(self.points) == 0:
+            return closestLabels
+
+        if self.arrays is None:
+            self._build_arrays()
+        labels, pointX, pointY, bucketOffsets = self.arrays
+        height = self.maxCell[1] - self.minCell[1] + 1
+
+        cellX = numpy.floor(queryX / self.cellSize).astype(numpy.int64)
+        cellY = numpy.floor(queryY / self.cellSize).astype(numpy.int64)
+        firstRings = numpy.maximum.reduce([numpy.zeros(len(queryX), dtype=numpy.int64),
+                                           self.minCell[0] - cellX, cellX - self.maxCell[0],
+                                           self.minCell[1] - cellY, cellY - self.maxCell[1]])
+        maximumRings = numpy.maximum.reduce([abs(cellX - self.minCell[0]), abs(cellX - self.maxCell[0]),
+                                             abs(cellY - self.minCell[1]), abs(cellY - self.maxCell[1])])
+        closestDistances = numpy.full(len(queryX), numpy.inf)
+
+        activeQueries = numpy.arange(len(queryX))
+        ring = firstRings.min()
+        while len(activeQueries) > 0:
+            #the rings in which none of the active queries has reached
+            #the buckets in use are skipped
+            searchingQueries = activeQueries[firstRings[activeQueries] <= ring]
+            if len(searchingQueries) == 0:
+                ring = firstRings[activeQueries].min()
+                searchingQueries = activeQueries[firstRings[activeQueries] <= ring]
+
+            #each query that has reached the buckets in use is paired with each bucket of its ring
+            owners, bucketX, bucketY = self._ring_cells_batch(cellX[searchingQueries], cellY[searchingQueries], ring)
+            queries = searchingQueries[owners]
+            buckets = (bucketX - self.minCell[0]) * height + bucketY - self.minCell[1]
+
+            #and then with each point in these buckets
+            starts = bucketOffsets[buckets]
+            counts = bucketOffsets[buckets+1] - starts
+            firstPositions = numpy.cumsum(counts) - counts
+            points = numpy.arange(counts.sum()) + numpy.repeat(starts - firstPositions, counts)
+            queries = numpy.repeat(queries, counts)
+
+            if len(points) > 0:
+                distances = (pointX[points] - queryX[queries])**2 + (pointY[points] - queryY[queries])**2
+
+                #the closest point of each query comes first after sorting
+                order = numpy.lexsort((distances, queries))
+                queries = queries[order]
+                first = numpy.concatenate(([True], queries[1:] != queries[:-1]))
+                queries = queries[first]
+                distances = distances[order][first]
+                points = points[order][first]
+
+                closer = distances < closestDistances[queries]
+                closestDistances[queries[closer]] = distances[closer]
+                closestLabels[queries[closer]] = labels[points[closer]]
+
+            unfinished = (closestDistances[activeQueries] > (ring * self.cellSize)**2) & (maximumRings[activeQueries] > ring)
+            activeQueries = activeQueries[unfinished]
+            ring += 1
+
+        return closestLabels
+
+    def _cell(self, x, y):
+        """Returns the (x, y) coordinates of the bucket containing a point."""
+        return int(math.floor(x / self.cellSize)), int(math.floor(y / self.cellSize))
+
+    def _ring_cells(self, cellX, cellY, ring):
+        """Returns a list with the buckets between the smallest and largest buckets
+        in use whose distance from the bucket ('cellX', 'cellY') is exactly 'ring' buckets.
+
+        """
+        minX, minY = max(cellX - ring, self.minCell[0]), max(cellY - ring, self.minCell[1])
+        maxX, maxY = min(cellX + ring, self.maxCell[0]), min(cellY + ring, self.maxCell[1])
+
+        cells = []
+        for y in (cellY - ring, cellY + ring):
+            if minY <= y <= maxY:
+                cells.extend([(x, y) for x in xrange(minX, maxX + 1)])
+            if ring == 0:
+                return cells
+        for x in (cellX - ring, cellX + ring):
+            if minX <= x <= maxX:
+                cells.extend([(x, y) for y in xrange(max(minY, cellY - ring + 1), min(maxY, cellY + ring - 1) + 1)])
+        return cells
+
+    def _ring_cells_batch(self, cellX, cellY, ring):
+        """Returns the buckets of '_ring_cells' for many buckets at once as three numpy arrays:
+        the index of the bucket in 'cellX' and 'cellY' that each ring bucket belongs to
+        and the x and y coordinates of the ring buckets.
+
+        """
+        minX = numpy.maximum(cellX - ring, self.minCell[0])
+        maxX = numpy.minimum(cellX + ring, self.maxCell[0])
+        minY = numpy.maximum(cellY - ring, self.minCell[1])
+        maxY = numpy.minimum(cellY + ring, self.maxCell[1])
+
+        #a ring consists of a bottom and a top row and a left and a right
+        #column without the corners, each of which is clipped separately;
+        #the ring at distance zero is a single bucket
+        sides = [(cellY - ring, minX, maxX, minY, maxY, True)]
+        if ring > 0:
+            sides.append((cellY + ring, minX, maxX, minY, maxY, True))
+            innerMinY = numpy.maximum(minY, cellY - ring + 1)
+            innerMaxY = numpy.minimum(maxY, cellY + ring - 1)
+            sides.append((cellX - ring, innerMinY, innerMaxY, minX, maxX, False))
+            sides.append((cellX + ring, innerMinY, innerMaxY, minX, maxX, False))
+
+        owners = []
+        xs = []
+        ys = []
+        for line, firstCells, lastCells, minLine, maxLine, horizontal in sides:
+            counts = numpy.where((line >= minLine) & (line <= maxLine), numpy.maximum(lastCells - firstCells + 1, 0), 0)
+            sideOwners = numpy.repeat(numpy.arange(len(cellX)), counts)
+            firstPositions = numpy.cumsum(counts) - counts
+            cells = numpy.arange(counts.sum()) + numpy.repeat(firstCells - firstPositions, counts)
+            owners.append(sideOwners)
+            if horizontal:
+                xs.append(cells)
+                ys.append(line[sideOwners])
+            else:
+                xs.append(line[sideOwners])
+                ys.append(cells)
+
+        #the buckets of each query stay in the same order as in '_ring_cells'
+        owners = numpy.concatenate(owners)
+        order = numpy.argsort(owners, kind='mergesort')
+        return owners[order], numpy.concatenate(xs)[order], numpy.concatenate(ys)[order]
+
+    def _add_to_bucket(self, label):
+        """Adds a point that is already in 'points' to its bucket."""
+        cell = self._cell(*self.points[label])
+        self.buckets.setdefault(cell, []).append(label)
+        if self.minCell[0] > self.maxCell[0]:
+            self.minCell = list(cell)
+            self.maxCell = list(cell)
+        else:
+            self.minCell = [min(self.minCell[0], cell[0]), min(self.minCell[1], cell[1])]
+            self.maxCell = [max(self.maxCell[0], cell[0]), max(self.maxCell[1], cell[1])]
+
+    def _rebuild(self):
+        """Chooses a new bucket size for the current points and puts the points into new buckets."""
+        coordinates = self.points.values()
+        xs = [x for x,_ in coordinates]
+        ys = [y for _,y in coordinates]
+        width = max(xs) - min(xs)
+        height = max(ys) - min(ys)
+
+        #about two points per bucket
+        area = max(width * height, max(width, height, 1.)**2 / len(coordinates))
+        self.cellSize = math.sqrt(2. * area / len(coordinates))
+
+        self.buckets = dict()
+        self.minCell = [0, 0]
+        self.maxCell = [-1, -1]
+        for label in self.points:
+            self._add_to_bucket(label)
+        self.numberOfPointsAtRebuild = len(self.points)
+
+    def _build_arrays(self):
+        """Creates the numpy arrays used by 'nearest_batch': the labels and coordinates
+        of the points sorted by bucket and the offsets of the buckets in these arrays.
+
+        """
+        labels = numpy.array(self.points.keys(), dtype=numpy.int64)
+        coordinates = numpy.array(self.points.values(), dtype=numpy.float64)
+        height = self.maxCell[1] - self.minCell[1] + 1
+        width = self.maxCell[0] - self.minCell[0] + 1
+
+        bucketX = numpy.floor(coordinates[:, 0] / self.cellSize).astype(numpy.int64) - self.minCell[0]
+        bucketY = numpy.floor(coordinates[:, 1] / self.cellSize).astype(numpy.int64) - self.minCell[1]
+        buckets = bucketX * height + bucketY
+        order = numpy.argsort(buckets, kind='mergesort')
+
+        bucketOffsets = numpy.zeros(width * height + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(buckets, minlength=width * height), out=bucketOffsets[1:])
+        self.arrays = (labels[order], coordinates[order, 0], coordinates[order, 1], bucketOffsets)
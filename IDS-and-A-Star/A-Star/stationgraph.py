@@ -0,0 +1,85 @@
+import coordinates
+import graph
+import numpy
+import os
+
+def generate_station_graph(numberOfStations, numberOfConnections, maxX=1000., maxY=1000., seed=0, cacheDirectory=None):
+    """Returns a random 'graph.Graph' with stations labelled 1, 2, ..., 'numberOfStations',
+    whose coordinates are between 1 and 'maxX'/'maxY', and 'numberOfConnections' different
+    directed edges between different stations. The stations and edges are sampled in bulk
+    with NumPy; if a cache directory is given, they are stored there and later calls
+    with the same parameters and seed load them instead of generating them again.
+
+    Keyword arguments:
+    numberOfStations -- Number of stations.
+    numberOfConnections -- Number of edges.
+    maxX -- The largest x coordinate of a station (default 1000.)
+    maxY -- The largest y coordinate of a station (default 1000.)
+    seed -- Seed of the random number generator (default 0).
+    cacheDirectory -- Directory of the cached graphs or 'None' if the graph shouldn't be cached (default None).
+
+    """
+    xCoordinates, yCoordinates, parents, children = generate_station_arrays(numberOfStations, numberOfConnections, maxX, maxY, seed, cacheDirectory)
+
+    stationGraph = graph.Graph()
+    for i, (x, y) in enumerate(zip(xCoordinates.tolist(), yCoordinates.tolist())):
+        stationGraph.add_node(graph.GraphNode(i+1, coordinates.Coordinates(x, y)))
+
+    for parent, child in zip(parents.tolist(), children.tolist()):
+        stationGraph.add_edge(parent, child)
+
+    return stationGraph
+
+def generate_station_arrays(numberOfStations, numberOfConnections, maxX=1000., maxY=1000., seed=0, cacheDirectory=None):
+    """Returns the random stations and edges used by 'generate_station_graph' as numpy arrays:
+    the x and y coordinates of the stations (the coordinates of station i are at index i-1)
+    and the labels of the parent and child stations of the edges.
+
+    Keyword arguments:
+    numberOfStations -- Number of stations.
+    numberOfConnections -- Number of edges.
+    maxX -- The largest x coordinate of a station (default 1000.)
+    maxY -- The largest y coordinate of a station (default 1000.)
+    seed -- Seed of the random number generator (default 0).
+    cacheDirectory -- Directory of the cached graphs or 'None' if the graph shouldn't be cached (default None).
+
+    """
+    if numberOfConnections > numberOfStations * (numberOfStations - 1):
+        raise ValueError('there are not enough pairs of different stations')
+
+    fileName = None
+    if cacheDirectory is not None:
+        fileName = os.path.join(cacheDirectory, 'stations_%d_%d_%g_%g_%d.npz' % (numberOfStations, numberOfConnections, maxX, maxY, seed))
+        if os.path.exists(fileName):
+            arrays = numpy.load(fileName)
+            stationArrays = (arrays['xCoordinates'], arrays['yCoordinates'], arrays['parents'], arrays['children'])
+            arrays.close()
+            return stationArrays
+
+    randomState = numpy.random.RandomState(seed)
+    xCoordinates = randomState.uniform(1., maxX, numberOfStations)
+    yCoordinates = randomState.uniform(1., maxY, numberOfStations)
+
+    #each edge is encoded as parent * numberOfStations + child; a few more edges than
+    #needed are sampled because some samples are duplicates, and the sampling
+    #is repeated until there are enough different edges
+    edges = numpy.zeros(0, dtype=numpy.int64)
+    while len(edges) < numberOfConnections:
+        numberOfSamples = numberOfConnections + numberOfConnections // 8 + 1
+        parents = randomState.randint(0, numberOfStations, numberOfSamples)
+
+        #adding a number between 1 and numberOfStations - 1 never gives the parent itself
+        children = (parents + randomState.randint(1, numberOfStations, numberOfSamples)) % numberOfStations
+        edges = numpy.unique(numpy.concatenate((edges, parents * numberOfStations + children)))
+
+    #'unique' sorts the edges, so a random subset of them is kept
+    edges = edges[randomState.permutation(len(edges))[:numberOfConnections]]
+    parents = edges // numberOfStations + 1
+    children = edges % numberOfStations + 1
+
+    if fileName is not None:
+        if not os.path.isdir(cacheDirectory):
+            os.makedirs(cacheDirectory)
+        numpy.savez(fileName, xCoordinates=xCoordinates, yCoordinates=yCoordinates, parents=parents, children=children)
+
+    return xCoordinates, yCoordinates, parents, children
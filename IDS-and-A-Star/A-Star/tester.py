@@ -1,31 +1,27 @@
 import aStar
-import graph
 import coordinates
+import os
 import random
-import math
+import stationgraph
+import sys
+import tempfile
 
 numberOfStations = 3500
 numberOfConnections = 15000
 maxX = 1000.
 maxY = 1000.
-stationGraph = graph.Graph()
-
-for i in xrange(numberOfStations):
-    xCoordinate = random.uniform(1.,maxX)
-    yCoordinate = random.uniform(1.,maxY)
-    nodeCoordinate = coordinates.Coordinates(xCoordinate, yCoordinate)
-    node = graph.GraphNode(i+1, nodeCoordinate)
-    stationGraph.add_node(node)
-
-for i in xrange(numberOfConnections):
-    parent = random.randint(1, numberOfStations)
-    while True:
-        child = random.randint(1, numberOfStations)
-
-        if child != parent:
-            added = stationGraph.add_edge(parent, child)
-            if added:
-                break
+
+#a new random graph is generated unless a seed is given as a command-line argument;
+#the seed is printed, so a graph can be recreated, and graphs of given seeds are
+#cached, so they are only generated the first time
+if len(sys.argv) > 1:
+    seed = int(sys.argv[1])
+    cacheDirectory = os.path.join(tempfile.gettempdir(), 'station_graphs')
+else:
+    seed = random.randint(0, 2**31 - 1)
+    cacheDirectory = None
+print 'Graph seed: %d (run "python tester.py %d" to use the same graph)' % (seed, seed)
+stationGraph = stationgraph.generate_station_graph(numberOfStations, numberOfConnections, maxX, maxY, seed, cacheDirectory)
 
 while True:
     stationSpecificationIdentifier = '0'
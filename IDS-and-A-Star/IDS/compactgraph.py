@@ -0,0 +1,111 @@
+import numpy
+
+class CompactGraph(object):
+    """Defines a read-only graph stored in compressed sparse row form.
+    The children of the node with label 'n' are
+    targets[offsets[n]:offsets[n+1]], so the graph needs only two arrays
+    and no objects per node or edge.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self, offsets, targets):
+        """Creates a graph from its offsets and targets arrays.
+
+        Keyword arguments:
+        offsets -- A numpy array with one entry per node label plus one.
+        targets -- A numpy array with the labels of the children of all nodes.
+
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.numberOfNodes = len(offsets) - 1
+
+    def neighbours(self, label):
+        """Returns a read-only view of the labels of the children of a node.
+
+        Keyword arguments:
+        label -- Label of the node.
+
+        """
+        return self.targets[self.offsets[label]:self.offsets[label+1]]
+
+    def number_of_edges(self):
+        """Returns the number of edges in the graph."""
+        return len(self.targets)
+
+
+class CompactGraphBuilder(object):
+    """Collects the edges of a graph and builds a 'CompactGraph' from them,
+    removing duplicate edges in a single pass over all edges.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self):
+        """Creates a builder without edges."""
+        self.parents = []
+        self.children = []
+        self.largestLabel = -1
+
+    def add_node(self, label):
+        """Makes sure that a node without children is part of the graph.
+
+        Keyword arguments:
+        label -- Label of the node; expected to be a nonnegative integer.
+
+        """
+        self.largestLabel = max(self.largestLabel, label)
+
+    def add_edges(self, parents, children):
+        """Adds a number of directed edges.
+
+        Keyword arguments:
+        parents -- A sequence with the labels of the parent nodes.
+        children -- A sequence with the labels of the child nodes.
+
+        """
+        parents = numpy.asarray(parents, dtype=numpy.int64)
+        children = numpy.asarray(children, dtype=numpy.int64)
+        if len(parents) != len(children):
+            raise ValueError('parents and children must have the same length')
+
+        if len(parents) > 0:
+            self.parents.append(parents)
+            self.children.append(children)
+            self.largestLabel = max(self.largestLabel, parents.max(), children.max())
+
+    def add_graph(self, graph):
+        """Adds all nodes and edges of a 'graph.Graph' object.
+
+        Keyword arguments:
+        graph -- A 'graph.Graph' object whose node labels are nonnegative integers.
+
+        """
+        parents = []
+        children = []
+        for label, node in graph.nodes.iteritems():
+            self.add_node(label)
+            for edge in node.children:
+                parents.append(label)
+                children.append(edge.connectedNode)
+        self.add_edges(parents, children)
+
+    def build(self):
+        """Returns a 'CompactGraph' with all edges added so far;
+        the children of each node are sorted by label.
+
+        """
+        numberOfNodes = self.largestLabel + 1
+        if len(self.parents) == 0:
+            return CompactGraph(numpy.zeros(numberOfNodes + 1, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64))
+
+        #each edge is encoded as a single number, so sorting the numbers
+        #groups the edges by parent and puts duplicates next to each other
+        edges = numpy.unique(numpy.concatenate(self.parents) * numberOfNodes + numpy.concatenate(self.children))
+        parents = edges // numberOfNodes
+        targets = edges % numberOfNodes
+
+        offsets = numpy.zeros(numberOfNodes + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(parents, minlength=numberOfNodes), out=offsets[1:])
+        return CompactGraph(offsets, targets)
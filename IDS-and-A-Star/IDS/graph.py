@@ -17,6 +17,9 @@ class GraphNode(object):
         self.label = label
         self.children = []
 
+        #the labels of the children make the duplicate edge check constant time
+        self.childLabels = set()
+
 
 class GraphEdge(object):
     """Defines a graph edge.
@@ -63,9 +66,11 @@ class Graph(object):
         childNodeKey -- Label of the child node.
 
         """
-        if childNodeKey not in self.nodes[parentNodeKey].children:
+        parentNode = self.nodes[parentNodeKey]
+        if childNodeKey not in parentNode.childLabels:
             parentToChildEdge = GraphEdge(childNodeKey)
-            self.nodes[parentNodeKey].children.append(parentToChildEdge)
+            parentNode.children.append(parentToChildEdge)
+            parentNode.childLabels.add(childNodeKey)
             return True
         else:
             return False
@@ -0,0 +1,103 @@
+from collections import deque
+import time
+
+class IncrementalSearch(object):
+    """Defines a search that runs in small steps instead of in a single call.
+    The algorithms are the generators of 'search.SearchLibrary', which pause after a fixed
+    number of expansions, so the caller decides how long the search runs: it can stop it when a time or
+    expansion budget is used up, run many searches in turns, or cancel it early.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self, searchLibrary, algorithm, start, goal, maximumLevelToExplore=None, expansionsPerStep=1000, transpositionTableSize=1048576):
+        """Prepares a search; no nodes are expanded before the first step.
+
+        Keyword arguments:
+        searchLibrary -- A 'search.SearchLibrary' object whose graph is searched.
+        algorithm -- 'dfs' (depth-first), 'bfs' (breadth-first), or 'ids' (iterative deepening search).
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+        maximumLevelToExplore -- The maximum depth level explored by iterative deepening search (default None).
+        expansionsPerStep -- Number of node expansions after which a step ends (default 1000).
+        transpositionTableSize -- Number of slots in the transposition table of iterative deepening search (default 1048576).
+
+        """
+        self.start = start
+        self.goal = goal
+        self.expansionsPerStep = expansionsPerStep
+
+        #'goalFound' is 'None' until the search is finished
+        self.numberOfExpandedNodes = 0
+        self.finished = False
+        self.goalFound = None
+
+        if algorithm == 'dfs':
+            self.steps = searchLibrary._depth_first_search_steps(start, goal, self, expansionsPerStep)
+        elif algorithm == 'bfs':
+            self.steps = searchLibrary._breadth_first_search_steps(start, goal, self, expansionsPerStep)
+        elif algorithm == 'ids':
+            if maximumLevelToExplore is None:
+                raise ValueError('iterative deepening search needs maximumLevelToExplore')
+            self.steps = searchLibrary._iterative_deepening_search_steps(start, goal, maximumLevelToExplore, transpositionTableSize, self, expansionsPerStep)
+        else:
+            raise ValueError('unknown algorithm ' + str(algorithm))
+
+    def step(self):
+        """Expands up to 'expansionsPerStep' nodes.
+        Returns 'True' if the search is finished and 'False' otherwise.
+
+        """
+        if not self.finished:
+            result = next(self.steps)
+            if result is not None:
+                self.goalFound = result
+                self.finished = True
+                self.steps.close()
+        return self.finished
+
+    def run(self, maximumExpansions=None, timeLimit=None):
+        """Runs steps until the search is finished or one of the budgets is used up;
+        the budgets are only checked between steps. Returns 'True' if the search is finished
+        and 'False' otherwise, in which case it can be continued by another call.
+
+        Keyword arguments:
+        maximumExpansions -- The maximum number of expansions in this call or 'None' for no limit (default None).
+        timeLimit -- The maximum running time of this call in seconds or 'None' for no limit (default None).
+
+        """
+        startTime = time.time()
+        startExpansions = self.numberOfExpandedNodes
+        while not self.step():
+            if maximumExpansions is not None and self.numberOfExpandedNodes - startExpansions >= maximumExpansions:
+                break
+            if timeLimit is not None and time.time() - startTime >= timeLimit:
+                break
+        return self.finished
+
+    def cancel(self):
+        """Stops the search and releases its memory; 'goalFound' stays 'None'."""
+        self.steps.close()
+        self.finished = True
+
+
+def run_interleaved(searches, timeLimit=None):
+    """Runs a number of 'IncrementalSearch' objects in turns, one step each,
+    until all of them are finished or the time limit is reached.
+    Returns 'True' if all searches are finished and 'False' otherwise.
+
+    Keyword arguments:
+    searches -- A list of 'IncrementalSearch' objects.
+    timeLimit -- The maximum running time in seconds or 'None' for no limit (default None).
+
+    """
+    startTime = time.time()
+    runningSearches = deque([search for search in searches if not search.finished])
+    while len(runningSearches) > 0:
+        search = runningSearches.popleft()
+        if not search.step():
+            runningSearches.append(search)
+
+        if timeLimit is not None and time.time() - startTime >= timeLimit:
+            break
+    return len(runningSearches) == 0
@@ -0,0 +1,163 @@
+from multiprocessing import sharedctypes
+import ctypes
+import multiprocessing
+import numpy
+
+#the shared arrays of the current process; they are set by '_initialize_worker' when
+#a worker process starts and in the parent process before each search
+_offsets = None
+_targets = None
+_visited = None
+_parents = None
+_frontier = None
+
+def _shared_array(elementType, size):
+    """Returns a (shared ctypes array, numpy view) pair for an array of 'size' elements.
+
+    Keyword arguments:
+    elementType -- A ctypes type with an explicit size (e.g. 'ctypes.c_int64'), so that
+                   the array has the same layout on all platforms.
+    size -- Number of elements.
+
+    """
+    sharedArray = sharedctypes.RawArray(elementType, max(size, 1))
+    return sharedArray, _numpy_view(sharedArray)[:size]
+
+def _numpy_view(sharedArray):
+    """Returns a numpy view of a shared ctypes array with the dtype of its elements."""
+    return numpy.frombuffer(sharedArray, dtype=numpy.dtype(sharedArray._type_))
+
+def _initialize_worker(offsets, targets, visited, parents, frontier):
+    """Creates numpy views of the shared arrays in a worker process."""
+    global _offsets, _targets, _visited, _parents, _frontier
+    _offsets = _numpy_view(offsets)
+    _targets = _numpy_view(targets)
+    _visited = _numpy_view(visited)
+    _parents = _numpy_view(parents)
+    _frontier = _numpy_view(frontier)
+
+def _expand_frontier_part(bounds):
+    """Expands the frontier nodes between the given positions of the shared frontier array,
+    marks their unvisited children as visited, and stores their parents.
+    Returns a numpy array with the labels of the newly visited children.
+
+    Keyword arguments:
+    bounds -- A (first position, position after the last) tuple.
+
+    """
+    nodes = _frontier[bounds[0]:bounds[1]]
+    starts = _offsets[nodes]
+    counts = _offsets[nodes+1] - starts
+
+    #the positions of all children in 'targets' are computed at once:
+    #the children of node i are at starts[i], starts[i]+1, ..., starts[i]+counts[i]-1
+    numberOfChildren = counts.sum()
+    firstPositions = numpy.cumsum(counts) - counts
+    positions = numpy.arange(numberOfChildren) + numpy.repeat(starts - firstPositions, counts)
+    children = _targets[positions]
+    parents = numpy.repeat(nodes, counts)
+
+    unvisited = _visited[children] == 0
+    children, firstOccurrences = numpy.unique(children[unvisited], return_index=True)
+    parents = parents[unvisited][firstOccurrences]
+
+    #another process may claim the same child in this level; both then store
+    #a parent from the current level, so either of them gives a shortest path
+    _visited[children] = 1
+    _parents[children] = parents
+    return children
+
+
+class ParallelBreadthFirstSearch(object):
+    """Defines a level-synchronous breadth-first search whose levels are
+    expanded by a pool of worker processes. The graph, the visited nodes and the
+    parents of the visited nodes are kept in shared memory, so each level only
+    sends the positions of the frontier parts to the workers and
+    receives the newly visited nodes from them.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self, graph, numberOfProcesses=None, minimumFrontierPerProcess=4096):
+        """Copies a graph to shared memory and starts the worker processes.
+
+        Keyword arguments:
+        graph -- A 'compactgraph.CompactGraph' object.
+        numberOfProcesses -- Number of worker processes (default: number of cores).
+        minimumFrontierPerProcess -- The smallest number of nodes in a part of the frontier;
+                                     smaller frontiers are expanded in the calling process (default 4096).
+
+        """
+        if numberOfProcesses is None:
+            numberOfProcesses = multiprocessing.cpu_count()
+        self.numberOfProcesses = numberOfProcesses
+        self.minimumFrontierPerProcess = minimumFrontierPerProcess
+        self.numberOfNodes = graph.numberOfNodes
+
+        #each shared array is used through a numpy view; the visited nodes
+        #are stored in one byte each, so concurrent updates of
+        #neighbouring nodes don't overwrite each other
+        sharedOffsets, self.offsets = _shared_array(ctypes.c_int64, len(graph.offsets))
+        sharedTargets, self.targets = _shared_array(ctypes.c_int64, len(graph.targets))
+        sharedVisited, self.visited = _shared_array(ctypes.c_uint8, self.numberOfNodes)
+        sharedParents, self.parents = _shared_array(ctypes.c_int64, self.numberOfNodes)
+        sharedFrontier, self.frontier = _shared_array(ctypes.c_int64, self.numberOfNodes)
+        self.offsets[:] = graph.offsets
+        self.targets[:] = graph.targets
+
+        self.sharedArrays = (sharedOffsets, sharedTargets, sharedVisited, sharedParents, sharedFrontier)
+        self.pool = multiprocessing.Pool(numberOfProcesses, _initialize_worker, self.sharedArrays)
+
+    def search(self, start, goal):
+        """Finds a shortest path from the node with label 'start' to the node with label 'goal'.
+        Returns a (found, depth, path) tuple, where 'found' is 'True' if the path is found,
+        'depth' is the number of edges on the path, and 'path' is a list with the labels of
+        the nodes on the path (including 'start' and 'goal'); if the path is not found,
+        'depth' is -1 and 'path' is empty.
+
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+
+        """
+        #small frontiers are expanded in this process, which
+        #may have been working on the arrays of another search
+        _initialize_worker(*self.sharedArrays)
+
+        self.visited[:] = 0
+        self.visited[start] = 1
+        self.parents[start] = -1
+        self.frontier[0] = start
+        frontierSize = 1
+        depth = 0
+
+        while not self.visited[goal] and frontierSize > 0:
+            depth += 1
+
+            #the frontier is split into more parts than there are processes,
+            #so processes that finish early can take over some of the work
+            numberOfParts = min(self.numberOfProcesses * 4, frontierSize // self.minimumFrontierPerProcess)
+            if numberOfParts < 2:
+                newNodes = [_expand_frontier_part((0, frontierSize))]
+            else:
+                bounds = numpy.linspace(0, frontierSize, numberOfParts + 1).astype(numpy.int64).tolist()
+                newNodes = self.pool.map(_expand_frontier_part, zip(bounds[:-1], bounds[1:]))
+
+            #processes may have claimed the same node, so duplicates are removed
+            newNodes = numpy.unique(numpy.concatenate(newNodes))
+            frontierSize = len(newNodes)
+            self.frontier[:frontierSize] = newNodes
+
+        if not self.visited[goal]:
+            return False, -1, []
+
+        path = [goal]
+        while path[-1] != start:
+            path.append(int(self.parents[path[-1]]))
+        path.reverse()
+        return True, depth, path
+
+    def close(self):
+        """Stops the worker processes."""
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,310 @@
+import compactgraph
+import numpy
+
+class ReachabilityIndex(object):
+    """Defines an index that answers whether a node can be reached from another node
+    without searching the graph in most cases.
+
+    The graph is condensed into its strongly connected components, which form a
+    directed acyclic graph; nodes in the same component can reach each other.
+    The components are numbered so that edges only lead to components with smaller
+    numbers, and each component is labelled with intervals coming from a few
+    depth-first traversals of the condensed graph: a component can only reach
+    components whose intervals lie within its own intervals. The first
+    traversal also gives an interval of the components in its search tree,
+    all of which are reachable. Queries that are not decided by the intervals
+    run a depth-first search of the condensed graph that skips all components
+    whose intervals exclude the goal.
+
+    Author: Aleksandar Mitrevski
+
+    """
+    def __init__(self, graph=None, numberOfTraversals=2, seed=0):
+        """Builds the index of a graph; if no graph is given,
+        an empty index is created, which can be filled by 'load'.
+
+        Keyword arguments:
+        graph -- A 'compactgraph.CompactGraph' object (default None).
+        numberOfTraversals -- Number of depth-first traversals used for labelling the components (default 2).
+        seed -- Seed of the random traversal orders (default 0).
+
+        """
+        self.components = None
+        self.condensation = None
+        self.postOrders = None
+        self.lowestPostOrders = None
+        self.treeLowestPostOrders = None
+
+        if graph is not None:
+            self.components = self._find_components(graph)
+
+            #the edges between different components form the condensed graph
+            parents = numpy.repeat(numpy.arange(graph.numberOfNodes), numpy.diff(graph.offsets))
+            parentComponents = self.components[parents]
+            childComponents = self.components[graph.targets]
+            crossEdges = parentComponents != childComponents
+
+            builder = compactgraph.CompactGraphBuilder()
+            builder.add_node(self.components.max())
+            builder.add_edges(parentComponents[crossEdges], childComponents[crossEdges])
+            self.condensation = builder.build()
+
+            self._label_components(numberOfTraversals, seed)
+
+    def reachable(self, start, goal):
+        """Returns 'True' if there is a path from the node with label 'start'
+        to the node with label 'goal' and 'False' otherwise.
+
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+
+        """
+        startComponent = int(self.components[start])
+        goalComponent = int(self.components[goal])
+        decision = self._decide(startComponent, goalComponent)
+        if decision is None:
+            decision = self._search_condensation(startComponent, goalComponent)
+        return decision
+
+    def reachable_batch(self, starts, goals):
+        """Answers many reachability queries at once.
+        Returns a numpy array of booleans whose i-th element is 'True'
+        if 'goals[i]' can be reached from 'starts[i]'.
+
+        Keyword arguments:
+        starts -- A sequence of start node labels.
+        goals -- A sequence of goal node labels of the same length.
+
+        """
+        startComponents = self.components[numpy.asarray(starts, dtype=numpy.int64)]
+        goalComponents = self.components[numpy.asarray(goals, dtype=numpy.int64)]
+
+        #the interval checks of all queries are done at once and
+        #only the undecided queries search the condensed graph
+        possible = startComponents >= goalComponents
+        for postOrders, lowestPostOrders in zip(self.postOrders, self.lowestPostOrders):
+            possible &= (lowestPostOrders[startComponents] <= lowestPostOrders[goalComponents])
+            possible &= (postOrders[goalComponents] <= postOrders[startComponents])
+
+        goalPostOrders = self.postOrders[0][goalComponents]
+        certain = (self.treeLowestPostOrders[startComponents] <= goalPostOrders) & (goalPostOrders <= self.postOrders[0][startComponents])
+        result = possible & certain
+
+        for query in numpy.flatnonzero(possible & ~certain).tolist():
+            result[query] = self._search_condensation(int(startComponents[query]), int(goalComponents[query]))
+        return result
+
+    def save(self, fileName):
+        """Saves the index to a .npz file.
+
+        Keyword arguments:
+        fileName -- Name of the file.
+
+        """
+        numpy.savez(fileName, components=self.components,
+                    offsets=self.condensation.offsets, targets=self.condensation.targets,
+                    postOrders=self.postOrders, lowestPostOrders=self.lowestPostOrders,
+                    treeLowestPostOrders=self.treeLowestPostOrders)
+
+    def load(self, fileName):
+        """Loads an index saved by 'save'.
+
+        Keyword arguments:
+        fileName -- Name of the file.
+
+        """
+        arrays = numpy.load(fileName)
+        self.components = arrays['components']
+        self.condensation = compactgraph.CompactGraph(arrays['offsets'], arrays['targets'])
+        self.postOrders = arrays['postOrders']
+        self.lowestPostOrders = arrays['lowestPostOrders']
+        self.treeLowestPostOrders = arrays['treeLowestPostOrders']
+        arrays.close()
+
+    def _find_components(self, graph):
+        """Finds the strongly connected components of a graph with Tarjan's algorithm.
+        Returns a numpy array with the component of each node; an edge between two
+        different components always leads to the component with the smaller number.
+
+        Keyword arguments:
+        graph -- A 'compactgraph.CompactGraph' object.
+
+        """
+        offsets = graph.offsets.tolist()
+        targets = graph.targets.tolist()
+        numberOfNodes = graph.numberOfNodes
+
+        order = [-1] * numberOfNodes
+        lowestOrder = [0] * numberOfNodes
+        components = [-1] * numberOfNodes
+        onStack = bytearray(numberOfNodes)
+        componentStack = []
+        numberOfVisitedNodes = 0
+        numberOfComponents = 0
+
+        for root in xrange(numberOfNodes):
+            if order[root] != -1:
+                continue
+
+            #the recursion is replaced by a stack of nodes
+            #and positions of their next children in 'targets'
+            order[root] = lowestOrder[root] = numberOfVisitedNodes
+            numberOfVisitedNodes += 1
+            componentStack.append(root)
+            onStack[root] = 1
+            nodeStack = [root]
+            positionStack = [offsets[root]]
+
+            while len(nodeStack) > 0:
+                node = nodeStack[-1]
+                position = positionStack[-1]
+                if position < offsets[node+1]:
+                    positionStack[-1] = position + 1
+                    child = targets[position]
+                    if order[child] == -1:
+                        order[child] = lowestOrder[child] = numberOfVisitedNodes
+                        numberOfVisitedNodes += 1
+                        componentStack.append(child)
+                        onStack[child] = 1
+                        nodeStack.append(child)
+                        positionStack.append(offsets[child])
+                    elif onStack[child] and order[child] < lowestOrder[node]:
+                        lowestOrder[node] = order[child]
+                    continue
+
+                nodeStack.pop()
+                positionStack.pop()
+                if len(nodeStack) > 0 and lowestOrder[node] < lowestOrder[nodeStack[-1]]:
+                    lowestOrder[nodeStack[-1]] = lowestOrder[node]
+
+                #'node' is the first visited node of its component,
+                #so the component consists of 'node' and the nodes above it on the stack
+                if lowestOrder[node] == order[node]:
+                    while True:
+                        member = componentStack.pop()
+                        onStack[member] = 0
+                        components[member] = numberOfComponents
+                        if member == node:
+                            break
+                    numberOfComponents += 1
+
+        return numpy.array(components, dtype=numpy.int64)
+
+    def _label_components(self, numberOfTraversals, seed):
+        """Labels the components with the post-order numbers of several depth-first traversals
+        of the condensed graph and the lowest post-order numbers reachable from them.
+
+        Keyword arguments:
+        numberOfTraversals -- Number of traversals.
+        seed -- Seed of the random traversal orders.
+
+        """
+        offsets = self.condensation.offsets.tolist()
+        targets = self.condensation.targets.tolist()
+        numberOfComponents = self.condensation.numberOfNodes
+        randomState = numpy.random.RandomState(seed)
+
+        self.postOrders = numpy.empty((numberOfTraversals, numberOfComponents), dtype=numpy.int64)
+        self.lowestPostOrders = numpy.empty((numberOfTraversals, numberOfComponents), dtype=numpy.int64)
+
+        for traversal in xrange(numberOfTraversals):
+            postOrders = [-1] * numberOfComponents
+            lowestPostOrders = [0] * numberOfComponents
+            treeLowestPostOrders = [0] * numberOfComponents
+            visited = bytearray(numberOfComponents)
+            numberOfFinishedComponents = 0
+
+            #the traversals differ in the order of the roots and of the children
+            childStep = 1 if traversal % 2 == 0 else -1
+            for root in randomState.permutation(numberOfComponents).tolist():
+                if visited[root]:
+                    continue
+
+                visited[root] = 1
+                treeLowestPostOrders[root] = numberOfFinishedComponents
+                nodeStack = [root]
+                positionStack = [offsets[root] if childStep == 1 else offsets[root+1] - 1]
+
+                while len(nodeStack) > 0:
+                    node = nodeStack[-1]
+                    position = positionStack[-1]
+                    if offsets[node] <= position < offsets[node+1]:
+                        positionStack[-1] = position + childStep
+                        child = targets[position]
+                        if not visited[child]:
+                            visited[child] = 1
+                            treeLowestPostOrders[child] = numberOfFinishedComponents
+                            nodeStack.append(child)
+                            positionStack.append(offsets[child] if childStep == 1 else offsets[child+1] - 1)
+                        continue
+
+                    #the graph is acyclic, so all children are finished before their parents
+                    nodeStack.pop()
+                    positionStack.pop()
+                    postOrders[node] = numberOfFinishedComponents
+                    lowestPostOrder = numberOfFinishedComponents
+                    for child in targets[offsets[node]:offsets[node+1]]:
+                        if lowestPostOrders[child] < lowestPostOrder:
+                            lowestPostOrder = lowestPostOrders[child]
+                    lowestPostOrders[node] = lowestPostOrder
+                    numberOfFinishedComponents += 1
+
+            self.postOrders[traversal] = postOrders
+            self.lowestPostOrders[traversal] = lowestPostOrders
+            if traversal == 0:
+                self.treeLowestPostOrders = numpy.array(treeLowestPostOrders, dtype=numpy.int64)
+
+    def _decide(self, startComponent, goalComponent):
+        """Returns 'True' or 'False' if the labels decide whether 'goalComponent' can be reached
+        from 'startComponent' and 'None' if the condensed graph has to be searched.
+
+        Keyword arguments:
+        startComponent -- Component of the start node.
+        goalComponent -- Component of the goal node.
+
+        """
+        if startComponent == goalComponent:
+            return True
+
+        #edges only lead to components with smaller numbers
+        if startComponent < goalComponent:
+            return False
+
+        for postOrders, lowestPostOrders in zip(self.postOrders, self.lowestPostOrders):
+            if lowestPostOrders[startComponent] > lowestPostOrders[goalComponent] or postOrders[goalComponent] > postOrders[startComponent]:
+                return False
+
+        if self.treeLowestPostOrders[startComponent] <= self.postOrders[0][goalComponent] <= self.postOrders[0][startComponent]:
+            return True
+
+        return None
+
+    def _search_condensation(self, startComponent, goalComponent):
+        """Searches the condensed graph for a path between two components, skipping
+        the components from which the labels show that the goal cannot be reached.
+
+        Keyword arguments:
+        startComponent -- Component of the start node.
+        goalComponent -- Component of the goal node.
+
+        """
+        offsets = self.condensation.offsets
+        targets = self.condensation.targets
+        stack = [startComponent]
+        visited = set(stack)
+
+        while len(stack) > 0:
+            component = stack.pop()
+            for child in targets[offsets[component]:offsets[component+1]].tolist():
+                if child in visited:
+                    continue
+                visited.add(child)
+
+                decision = self._decide(child, goalComponent)
+                if decision:
+                    return True
+                if decision is None:
+                    stack.append(child)
+
+        return False
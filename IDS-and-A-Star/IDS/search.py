@@ -1,15 +1,6 @@
+from array import array
 from collections import deque
-
-class SearchNode(object):
-    """Defines a grid search node.
-
-    Author: Aleksandar Mitrevski
-
-    """
-    def __init__(self, nodeLabel=0, level=0):
-        self.nodeLabel = nodeLabel
-        self.level = level
-
+import compactgraph
 
 class SearchLibrary(object):
     """Defines a grid search library.
@@ -18,134 +9,334 @@ class SearchLibrary(object):
 
     """
     def __init__(self, graph):
+        """Creates a search library.
+
+        Keyword arguments:
+        graph -- A 'graph.Graph' or a 'compactgraph.CompactGraph' object;
+                 a 'graph.Graph' is converted to a 'compactgraph.CompactGraph'.
+
+        """
+        if not isinstance(graph, compactgraph.CompactGraph):
+            builder = compactgraph.CompactGraphBuilder()
+            builder.add_graph(graph)
+            graph = builder.build()
         self.graph = graph
+        self.numberOfExpandedNodes = 0
+        self.numberOfSavedExpansions = 0
 
-    def _generate_neighbours(self, currentNode):
-        """Returns a list of 'SearchNode' objects representing all neighbours of 'currentNode'.
+    def depthFirstSearch(self, start, goal):
+        """Explores a graph using a depth-first search strategy.
+        Finds the first path from the node with label 'start' to the node with label 'goal'.
+        Returns 'True' if the path is found and 'False' otherwise.
 
         Keyword arguments:
-        currentNode -- A 'SearchNode' object.
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
 
         """
-        adjacentNodes = []
+        self.numberOfExpandedNodes = 0
+        return self._run_steps(self._depth_first_search_steps(start, goal, self))
 
-        for _,child in enumerate(self.graph.nodes[currentNode.nodeLabel].children):
-            childLabel = child.connectedNode
-            newNode = SearchNode(childLabel, currentNode.level+1)
-            adjacentNodes.append(newNode)
+    def breadthFirstSearch(self, start, goal):
+        """Explores a graph using a breadth-first search strategy.
+        Finds the first path from the node with label 'start' to the node with label 'goal'.
+        Returns 'True' if the path is found and 'False' otherwise.
 
-        return adjacentNodes
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
 
-    #<summary>Explores a grid of nodes using a depth-first search strategy.</summary>
-    #<returns>A list of 'grid.Coordinates' objects that store the positions of the goal nodes found.</returns>
-    def depthFirstSearch(self, start, goal):
-        """Explores a graph using a depth-first search strategy.
+        """
+        self.numberOfExpandedNodes = 0
+        return self._run_steps(self._breadth_first_search_steps(start, goal, self))
+
+    def iterativeDeepeningSearch(self, start, goal, maximumLevelToExplore, transpositionTableSize=1048576):
+        """Explores a graph using an iterative deepening depth-first search strategy.
         Finds the first path from the node with label 'start' to the node with label 'goal'.
         Returns 'True' if the path is found and 'False' otherwise.
 
+        Each iteration uses a transposition table, so nodes that are reached
+        again at the same or a deeper level are not expanded again
+        (see '_depth_limited_search').
+
         Keyword arguments:
         start -- A label (an integer) representing the start node.
         goal -- A label (an integer) representing the goal node.
+        maximumLevelToExplore -- The maximum depth level that should be explored.
+        transpositionTableSize -- Number of slots in the transposition table;
+                                  each slot takes 16 bytes and 0 turns the table off (default 1048576).
 
         """
-        startPosition = SearchNode(start,0)
+        self.numberOfExpandedNodes = 0
+        return self._run_steps(self._iterative_deepening_search_steps(start, goal, maximumLevelToExplore, transpositionTableSize, self))
+
+    def frontierIterativeDeepeningSearch(self, start, goal, maximumLevelToExplore, frontierBudget=1048576, transpositionTableSize=1048576):
+        """Explores a graph level by level like iterative deepening search, but keeps
+        the nodes of the deepest level (the frontier) between iterations, so an
+        iteration only expands the frontier instead of starting again from 'start'.
+        Once the frontier grows beyond 'frontierBudget' nodes, it is discarded and
+        the remaining levels are explored by classic iterative deepening.
+        Finds the first path from the node with label 'start' to the node with label 'goal'.
+        Returns 'True' if the path is found and 'False' otherwise.
+
+        The number of expansions that classic iterative deepening would have repeated
+        is stored in 'numberOfSavedExpansions'.
 
-        stack = [startPosition]
-        goalPositionFound = False
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+        maximumLevelToExplore -- The maximum depth level that should be explored.
+        frontierBudget -- The maximum number of nodes kept in the frontier (default 1048576).
+        transpositionTableSize -- Number of slots in the transposition table used after
+                                  falling back to classic iterative deepening (default 1048576).
+
+        """
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        self.numberOfExpandedNodes = 0
+        self.numberOfSavedExpansions = 0
+
+        if start == goal:
+            return True
+
+        #'visited' contains the nodes of all levels explored so far,
+        #so a node only enters the frontier at the level at which it is first reached
+        visited = bytearray(self.graph.numberOfNodes)
+        visited[start] = 1
+        frontier = [start]
+        level = 0
+
+        while level < maximumLevelToExplore and len(frontier) > 0:
+            #classic iterative deepening would have expanded
+            #all nodes above the frontier once more
+            self.numberOfSavedExpansions += self.numberOfExpandedNodes
+
+            nextFrontier = []
+            for currentNode in frontier:
+                self.numberOfExpandedNodes += 1
+                for neighbour in targets[offsets[currentNode]:offsets[currentNode+1]].tolist():
+                    if neighbour == goal:
+                        return True
+
+                    if not visited[neighbour]:
+                        visited[neighbour] = 1
+                        nextFrontier.append(neighbour)
+
+                if len(nextFrontier) > frontierBudget:
+                    break
+
+            level += 1
+            if len(nextFrontier) > frontierBudget:
+                #the frontier doesn't fit in the budget, so the level that was
+                #being built and all deeper ones are explored by restarting from 'start'
+                frontier = nextFrontier = visited = None
+                maxLevel = level - 1
+                while maxLevel < maximumLevelToExplore:
+                    maxLevel += 1
+                    if self._depth_limited_search(start, goal, maxLevel, transpositionTableSize):
+                        return True
+                return False
+
+            frontier = nextFrontier
+
+        return False
+
+    def _depth_first_search_steps(self, start, goal, counter, expansionsPerStep=None):
+        """Generator that runs a depth-first search (see '_run_steps' for the values it yields).
+
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+        counter -- An object whose 'numberOfExpandedNodes' attribute is increased with each expansion.
+        expansionsPerStep -- The search pauses whenever 'counter.numberOfExpandedNodes' reaches a multiple
+                             of this number or never pauses if it is 'None' (default None).
+
+        """
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        stack = [start]
+        visited = bytearray(self.graph.numberOfNodes)
 
         #as long as we have nodes to process, we take
         #the neighbours of the current node, append them to the stack,
-        #and stop the search if the goal node is found
-        while len(stack) > 0 and not goalPositionFound:
+        #and stop the search if the goal node is found;
+        #the neighbours are pushed in reverse order, so the first one is expanded first
+        while len(stack) > 0:
             currentNode = stack.pop()
 
-            if currentNode.nodeLabel == goal:
-                goalPositionFound = True
+            if currentNode == goal:
+                yield True
+                return
+
+            #a node can be on the stack more than once,
+            #but it is only expanded the first time it is taken from it
+            if visited[currentNode]:
                 continue
+            visited[currentNode] = 1
 
-            neighbours = self._generate_neighbours(currentNode)
-            numberOfNeighbours = len(neighbours)
+            counter.numberOfExpandedNodes += 1
+            neighbours = targets[offsets[currentNode]:offsets[currentNode+1]][::-1].tolist()
+            stack.extend([neighbour for neighbour in neighbours if not visited[neighbour]])
 
-            while len(neighbours) > 0:
-                neighbour = neighbours.pop()
-                stack.append(neighbour)
+            if expansionsPerStep is not None and counter.numberOfExpandedNodes % expansionsPerStep == 0:
+                yield None
 
-        return goalPositionFound
+        yield False
 
-    def breadthFirstSearch(self, start, goal):
-        """Explores a graph using a breadth-first search strategy.
-        Finds the first path from the node with label 'start' to the node with label 'goal'.
-        Returns 'True' if the path is found and 'False' otherwise.
+    def _breadth_first_search_steps(self, start, goal, counter, expansionsPerStep=None):
+        """Generator that runs a breadth-first search (see '_run_steps' for the values it yields).
 
         Keyword arguments:
         start -- A label (an integer) representing the start node.
         goal -- A label (an integer) representing the goal node.
+        counter -- An object whose 'numberOfExpandedNodes' attribute is increased with each expansion.
+        expansionsPerStep -- The search pauses whenever 'counter.numberOfExpandedNodes' reaches a multiple
+                             of this number or never pauses if it is 'None' (default None).
 
         """
-        startPosition = SearchNode(start,0)
-
-        queue = deque([startPosition])
-        goalPositionFound = False
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        queue = deque([start])
+        visited = bytearray(self.graph.numberOfNodes)
+        visited[start] = 1
 
         #as long as we have nodes to process, we take
         #the neighbours of the current node, append them to the queue,
-        #and stop the search if the goal node is found
-        while len(queue) > 0 and not goalPositionFound:
+        #and stop the search if the goal node is found;
+        #nodes are marked as visited when they are added to the queue,
+        #so each node is added at most once
+        while len(queue) > 0:
             currentNode = queue.popleft()
 
-            if currentNode.nodeLabel == goal:
-                goalPositionFound = True
-                continue
+            if currentNode == goal:
+                yield True
+                return
 
-            neighbours = self._generate_neighbours(currentNode)
-            numberOfNeighbours = len(neighbours)
+            counter.numberOfExpandedNodes += 1
+            for neighbour in targets[offsets[currentNode]:offsets[currentNode+1]].tolist():
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    queue.append(neighbour)
 
-            while len(neighbours) > 0:
-                neighbour = neighbours.pop()
-                queue.append(neighbour)
+            if expansionsPerStep is not None and counter.numberOfExpandedNodes % expansionsPerStep == 0:
+                yield None
 
-        return goalPositionFound
+        yield False
 
-    def iterativeDeepeningSearch(self, start, goal, maximumLevelToExplore):
-        """Explores a graph using an iterative deepening depth-first search strategy.
-        Finds the first path from the node with label 'start' to the node with label 'goal'.
-        Returns 'True' if the path is found and 'False' otherwise.
+    def _iterative_deepening_search_steps(self, start, goal, maximumLevelToExplore, transpositionTableSize, counter, expansionsPerStep=None):
+        """Generator that runs an iterative deepening search (see '_run_steps' for the values it yields).
 
         Keyword arguments:
         start -- A label (an integer) representing the start node.
         goal -- A label (an integer) representing the goal node.
         maximumLevelToExplore -- The maximum depth level that should be explored.
+        transpositionTableSize -- Number of slots in the transposition table; 0 turns the table off.
+        counter -- An object whose 'numberOfExpandedNodes' attribute is increased with each expansion.
+        expansionsPerStep -- The search pauses whenever 'counter.numberOfExpandedNodes' reaches a multiple
+                             of this number or never pauses if it is 'None' (default None).
+
+        """
+        for maxLevel in xrange(maximumLevelToExplore + 1):
+            for result in self._depth_limited_search_steps(start, goal, maxLevel, transpositionTableSize, counter, expansionsPerStep):
+                if result is None:
+                    yield None
+                elif result:
+                    yield True
+                    return
+
+        yield False
+
+    def _depth_limited_search(self, start, goal, maxLevel, transpositionTableSize):
+        """Runs one iteration of iterative deepening search (see '_depth_limited_search_steps').
+        Returns 'True' if the goal is found and adds the expanded nodes to 'numberOfExpandedNodes'.
+
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+        maxLevel -- The depth limit of the iteration.
+        transpositionTableSize -- Number of slots in the transposition table; 0 turns the table off.
 
         """
-        startPosition = SearchNode(start,0)
-        goalPositionFound = False
-        maxLevel = -1
+        return self._run_steps(self._depth_limited_search_steps(start, goal, maxLevel, transpositionTableSize, self))
+
+    def _depth_limited_search_steps(self, start, goal, maxLevel, transpositionTableSize, counter, expansionsPerStep=None):
+        """Generator that runs one iteration of iterative deepening search, i.e. a depth-first search
+        that doesn't expand nodes at level 'maxLevel' (see '_run_steps' for the values it yields).
+
+        A transposition table stores the shallowest level at which a node has been
+        expanded in this iteration, so a node that is reached again at the
+        same or a deeper level is not expanded again. The table has a fixed number
+        of slots and each node can only be stored in one of them; when two nodes
+        need the same slot, the one expanded at a shallower level is kept.
+
+        Keyword arguments:
+        start -- A label (an integer) representing the start node.
+        goal -- A label (an integer) representing the goal node.
+        maxLevel -- The depth limit of the iteration.
+        transpositionTableSize -- Number of slots in the transposition table; 0 turns the table off.
+        counter -- An object whose 'numberOfExpandedNodes' attribute is increased with each expansion.
+        expansionsPerStep -- The search pauses whenever 'counter.numberOfExpandedNodes' reaches a multiple
+                             of this number or never pauses if it is 'None' (default None).
+
+        """
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+
+        #the graph may have fewer nodes than the table has slots,
+        #in which case each node gets its own slot
+        transpositionTableSize = min(transpositionTableSize, self.graph.numberOfNodes)
+        if transpositionTableSize > 0:
+            tableLabels = array('l', [-1]) * transpositionTableSize
+            tableLevels = array('l', [0]) * transpositionTableSize
 
         #as long as we have nodes to process, we take
         #the neighbours of the current node, append them to the stack,
-        #and stop the search if the goal node is found
-        while not goalPositionFound and maxLevel < maximumLevelToExplore:
-            stack = [startPosition]
-            maxLevel += 1
+        #and stop the search if the goal node is found;
+        #the stack stores (label, level) pairs
+        stack = [(start, 0)]
+        while len(stack) > 0:
+            currentNode, level = stack.pop()
+
+            if currentNode == goal:
+                yield True
+                return
+
+            #we get the neighbours of the current node only if
+            #they don't exceed the maximum level that we want to explore
+            if level >= maxLevel:
+                continue
 
-            while len(stack) > 0 and not goalPositionFound:
-                currentNode = stack.pop()
+            if transpositionTableSize > 0:
+                slot = currentNode % transpositionTableSize
+                if tableLabels[slot] == currentNode:
+                    if tableLevels[slot] <= level:
+                        continue
+                    tableLevels[slot] = level
+                elif tableLabels[slot] == -1 or level <= tableLevels[slot]:
+                    tableLabels[slot] = currentNode
+                    tableLevels[slot] = level
 
-                if currentNode.nodeLabel == goal:
-                    goalPositionFound = True
-                    continue
+            counter.numberOfExpandedNodes += 1
+            neighbourLevel = level + 1
+            neighbours = targets[offsets[currentNode]:offsets[currentNode+1]][::-1].tolist()
+            stack.extend([(neighbour, neighbourLevel) for neighbour in neighbours])
 
-                #we get the neighbours of the current node only if
-                #they don't exceed the maximum level that we want to explore
-                if(currentNode.level < maxLevel):
-                    neighbours = self._generate_neighbours(currentNode)
-                    numberOfNeighbours = len(neighbours)
+            if expansionsPerStep is not None and counter.numberOfExpandedNodes % expansionsPerStep == 0:
+                yield None
 
-                    while len(neighbours) > 0:
-                        neighbour = neighbours.pop()
-                        stack.append(neighbour)
+        yield False
 
-            if goalPositionFound:
-                break
+    def _run_steps(self, steps):
+        """Runs a search generator to completion and returns its result.
 
-        return goalPositionFound
+        The search generators yield 'None' whenever they pause and 'True' (the goal is found)
+        or 'False' (the goal is not found) as their last value, so the same implementation is used
+        by the methods of this class and, one step at a time, by 'incrementalsearch.IncrementalSearch'.
+
+        Keyword arguments:
+        steps -- A generator returned by one of the '_..._steps' methods.
+
+        """
+        for result in steps:
+            pass
+        return result
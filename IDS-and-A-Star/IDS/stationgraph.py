@@ -0,0 +1,66 @@
+import compactgraph
+import numpy
+import os
+
+def generate_station_graph(numberOfStations, numberOfConnections, seed=0, cacheDirectory=None):
+    """Returns a random 'compactgraph.CompactGraph' in which each of the stations
+    1, 2, ..., 'numberOfStations' has edges to 'numberOfConnections' different other stations
+    (label 0 is not a station and has no edges). The edges are sampled in bulk with NumPy;
+    if a cache directory is given, the graph is stored there and later calls
+    with the same parameters and seed load it instead of generating it again.
+
+    Keyword arguments:
+    numberOfStations -- Number of stations.
+    numberOfConnections -- Number of edges leaving each station.
+    seed -- Seed of the random number generator (default 0).
+    cacheDirectory -- Directory of the cached graphs or 'None' if the graph shouldn't be cached (default None).
+
+    """
+    if numberOfConnections > numberOfStations - 1:
+        raise ValueError('a station can have at most numberOfStations - 1 connections')
+
+    fileName = None
+    if cacheDirectory is not None:
+        fileName = os.path.join(cacheDirectory, 'stations_%d_%d_%d.npz' % (numberOfStations, numberOfConnections, seed))
+        if os.path.exists(fileName):
+            arrays = numpy.load(fileName)
+            stationGraph = compactgraph.CompactGraph(arrays['offsets'], arrays['targets'])
+            arrays.close()
+            return stationGraph
+
+    randomState = numpy.random.RandomState(seed)
+    edges = numpy.zeros(0, dtype=numpy.int64)
+    missingConnections = numpy.full(numberOfStations, numberOfConnections, dtype=numpy.int64)
+
+    #each edge is encoded as parent * numberOfStations + child; the stations sample a few
+    #more children than they need because some samples are duplicates, the duplicates are
+    #removed, and the stations that still have too few children sample again
+    while missingConnections.sum() > 0:
+        parents = numpy.repeat(numpy.arange(numberOfStations), missingConnections + missingConnections // 8 + 1)
+
+        #adding a number between 1 and numberOfStations - 1 never gives the parent itself
+        children = (parents + randomState.randint(1, numberOfStations, len(parents))) % numberOfStations
+        edges = numpy.unique(numpy.concatenate((edges, parents * numberOfStations + children)))
+
+        #the edges are grouped by parent and put in random order within each group
+        #(a random number below 1 is added to the parent of each edge before sorting),
+        #so the first 'numberOfConnections' edges of each parent are a random choice
+        parents = edges // numberOfStations
+        edges = edges[numpy.argsort(parents + randomState.random_sample(len(edges)))]
+        parents = edges // numberOfStations
+        counts = numpy.bincount(parents, minlength=numberOfStations)
+        ranks = numpy.arange(len(edges)) - (numpy.cumsum(counts) - counts)[parents]
+        edges = edges[ranks < numberOfConnections]
+        missingConnections = numberOfConnections - numpy.bincount(edges // numberOfStations, minlength=numberOfStations)
+
+    builder = compactgraph.CompactGraphBuilder()
+    builder.add_node(numberOfStations)
+    builder.add_edges(edges // numberOfStations + 1, edges % numberOfStations + 1)
+    stationGraph = builder.build()
+
+    if fileName is not None:
+        if not os.path.isdir(cacheDirectory):
+            os.makedirs(cacheDirectory)
+        numpy.savez(fileName, offsets=stationGraph.offsets, targets=stationGraph.targets)
+
+    return stationGraph
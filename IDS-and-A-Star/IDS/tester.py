@@ -1,25 +1,26 @@
-import graph
+import os
 import random
 import search
+import stationgraph
+import sys
+import tempfile
 
 numberOfStations = 3000
 numberOfConnections = 500
-stationGraph = graph.Graph()
 
-print 'Generating graph...'
-for i in xrange(numberOfStations):
-    node = graph.GraphNode(i+1)
-    stationGraph.add_node(node)
-
-for parent in xrange(numberOfStations):
-    for j in xrange(numberOfConnections):
-        while True:
-            child = random.randint(1, numberOfStations)
+#a new random graph is generated unless a seed is given as a command-line argument;
+#the seed is printed, so a graph can be recreated, and graphs of given seeds are
+#cached, so they are only generated the first time
+if len(sys.argv) > 1:
+    seed = int(sys.argv[1])
+    cacheDirectory = os.path.join(tempfile.gettempdir(), 'station_graphs')
+else:
+    seed = random.randint(0, 2**31 - 1)
+    cacheDirectory = None
+print 'Graph seed: %d (run "python tester.py %d" to use the same graph)' % (seed, seed)
 
-            if child != (parent+1):
-                added = stationGraph.add_edge(parent+1, child)
-                if added:
-                    break
+print 'Generating graph...'
+stationGraph = stationgraph.generate_station_graph(numberOfStations, numberOfConnections, seed, cacheDirectory)
 
 searchLibrary = search.SearchLibrary(stationGraph)
 
@@ -29,6 +30,15 @@ if goalFound:
     print 'Solution found by iterative deepening search (IDS)'
 else:
     print 'Solution not found by iterative deepening search (IDS)'
+print 'Nodes expanded by IDS: %d' % searchLibrary.numberOfExpandedNodes
+
+print '\nFrontier-preserving iterative deepening search running...'
+goalFound = searchLibrary.frontierIterativeDeepeningSearch(10,241,10)
+if goalFound:
+    print 'Solution found by frontier-preserving IDS'
+else:
+    print 'Solution not found by frontier-preserving IDS'
+print 'Nodes expanded by frontier-preserving IDS: %d (%d repeated expansions saved)' % (searchLibrary.numberOfExpandedNodes, searchLibrary.numberOfSavedExpansions)
 
 algorithmChoice = '0'
 while algorithmChoice != '1' and algorithmChoice != '2':
@@ -43,6 +53,7 @@ if algorithmChoice == '1':
         print 'Solution found by depth-first search'
     else:
         print 'Solution not found by depth-first search'
+    print 'Nodes expanded by depth-first search: %d' % searchLibrary.numberOfExpandedNodes
 else:
     print '\nBreadth first search running...'
     goalFound = searchLibrary.breadthFirstSearch(10,241)
@@ -50,3 +61,4 @@ else:
         print 'Solution found by breadth-first search'
     else:
         print 'Solution not found by breadth-first search'
+    print 'Nodes expanded by breadth-first search: %d' % searchLibrary.numberOfExpandedNodes